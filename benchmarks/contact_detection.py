@@ -0,0 +1,103 @@
+"""
+Microbenchmark for contact detection in utils/validators.
+
+Compares the original multi-pass implementation (kept here verbatim as
+the baseline) with the precompiled single-pass detect_contact_type and
+the bulk detect_contact_types, and checks that all three agree.
+
+Usage:
+    python benchmarks/contact_detection.py [--inputs N] [--repeat N]
+"""
+
+import argparse
+import random
+import re
+import string
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import MIN_EMAIL_LENGTH, MIN_PHONE_DIGITS  # noqa: E402
+from utils.validators import detect_contact_type, detect_contact_types  # noqa: E402
+
+
+def legacy_validate_email(email):
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    if not email or len(email) < MIN_EMAIL_LENGTH:
+        return False
+    if email.startswith('.') or email.endswith('.') or '..' in email:
+        return False
+    if email.count('@') != 1:
+        return False
+    return bool(re.match(pattern, email))
+
+
+def legacy_validate_phone(phone):
+    if not phone:
+        return False
+    clean_phone = re.sub(r'\D', '', phone)
+    if len(clean_phone) < MIN_PHONE_DIGITS:
+        return False
+    if len(clean_phone) > 15:
+        return False
+    return clean_phone.isdigit()
+
+
+def legacy_detect_contact_type(contact_input):
+    if not contact_input or not contact_input.strip():
+        return "invalid", ""
+    contact_input = contact_input.strip()
+    if legacy_validate_email(contact_input):
+        return "email", contact_input.strip().lower()
+    if legacy_validate_phone(contact_input):
+        return "phone", re.sub(r'\D', '', contact_input)
+    return "invalid", contact_input
+
+
+def generate_inputs(count, seed=7):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "._%+-@ ()"
+    inputs = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            inputs.append(f" User.{i}@Example.com ")
+        elif kind == 1:
+            inputs.append(f"+57 ({rng.randint(100, 999)}) {rng.randint(1000000, 9999999)}")
+        elif kind == 2:
+            inputs.append("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20))))
+        else:
+            inputs.append(rng.choice(["a..b@x.com", ".a@x.com", "a@b.c", "123", "a@b@c.com", ""]))
+    return inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inputs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    inputs = generate_inputs(args.inputs)
+    
+    expected = [legacy_detect_contact_type(value) for value in inputs]
+    assert [detect_contact_type(value) for value in inputs] == expected
+    assert detect_contact_types(inputs) == expected
+    
+    candidates = {
+        "legacy": lambda: [legacy_detect_contact_type(value) for value in inputs],
+        "single-pass": lambda: [detect_contact_type(value) for value in inputs],
+        "bulk": lambda: detect_contact_types(inputs),
+    }
+    
+    baseline = None
+    for label, func in candidates.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        per_call = best / len(inputs) * 1e9
+        baseline = baseline or per_call
+        print(f"{label:>12}: {per_call:8.0f} ns/call  speedup x{baseline / per_call:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+End-to-end conversation throughput against fake Sheets and LLM backends.
+
+Scripted conversations run through the compiled lead graph with the
+Sheets storage backend, for sheets that already hold 100 to 1M leads.
+Both backends are in-process fakes with configurable latency and error
+injection, so the numbers are reproducible and need no network.
+
+Reports per sheet size: conversations/s, p50/p99 conversation latency,
+Sheets API and LLM calls per lead, and memory held by a paused session.
+
+Usage:
+    python benchmarks/conversations.py [--rows 100,10000,1000000] [--sessions N]
+        [--concurrency N] [--sheets-latency-ms MS] [--llm-latency-ms MS]
+        [--error-rate R] [--partitioning monthly] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+_workdir = tempfile.mkdtemp(prefix="lead-bench-")
+os.environ["LEAD_STORAGE_BACKEND"] = "sheets"
+os.environ["SHEETS_OUTBOX_PATH"] = os.path.join(_workdir, "outbox.db")
+os.environ.pop("CLASSIFICATION_CACHE_PATH", None)
+os.environ.pop("METRICS_ENABLED", None)
+
+from channels.memory import QueueChannel  # noqa: E402
+from config import SHEETS_CONFIG  # noqa: E402
+from fakes import FakeChatModel, FakeFaults, FakeGoogleSheetsService, FakeSheets, sheet_with_rows  # noqa: E402
+from flow.graph import new_session, run_conversation  # noqa: E402
+from services.google_sheets import sheets_service  # noqa: E402
+from services.lead_storage import flush_storage  # noqa: E402
+from services.llm_classifier import event_classifier  # noqa: E402
+from services.llm_router import LLMBackend, LLMRouter  # noqa: E402
+
+
+# Explicit answer, a description the keyword classifier settles, and one
+# that needs the LLM
+SCRIPTS = [
+    ["1", "Conferencia anual"],
+    ["3", "Lanzamiento de producto para clientes de la empresa"],
+    ["3", "Una reunión especial el fin de semana"],
+]
+
+
+def script(index: int) -> List[str]:
+    return SCRIPTS[index % len(SCRIPTS)] + ["5000", f"Lead {index}", f"lead{index}@bench.test"]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def install_fakes(rows: int, sheets_faults: FakeFaults, chat_model: FakeChatModel) -> FakeSheets:
+    """Point the Sheets service and the LLM classifier at fresh fakes."""
+    sheets = FakeSheets(sheet_with_rows(rows, SHEETS_CONFIG["headers"]), sheets_faults)
+    sheets_service.override(FakeGoogleSheetsService(sheets))
+    
+    classifier = event_classifier.get()
+    classifier.llm = LLMRouter([LLMBackend("fake", chat_model)])
+    classifier.model_name = f"fake-{rows}"
+    classifier.template_hash = None
+    classifier._refresh_chain()
+    return sheets
+
+
+async def run_sessions(first: int, count: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    
+    async def one(index: int) -> None:
+        async with semaphore:
+            graph, state = new_session()
+            start = time.perf_counter()
+            await run_conversation(graph, state, QueueChannel(script(index)))
+            latencies.append(time.perf_counter() - start)
+    
+    await asyncio.gather(*(one(first + i) for i in range(count)))
+    return latencies
+
+
+async def session_memory(first: int, count: int) -> float:
+    """Bytes held per session while it waits for the user's budget."""
+    channels = [QueueChannel(script(first + i)[:2]) for i in range(count)]
+    
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = []
+    for channel in channels:
+        graph, state = new_session()
+        tasks.append(asyncio.ensure_future(run_conversation(graph, state, channel)))
+    
+    while any(not channel.inputs.empty() for channel in channels):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return held / count
+
+
+def benchmark(rows: int, args: argparse.Namespace) -> Dict[str, Any]:
+    chat_model = FakeChatModel(latency=args.llm_latency_ms / 1000, error_rate=args.error_rate)
+    faults = FakeFaults(args.sheets_latency_ms / 1000, args.error_rate, seed=args.seed)
+    sheets = install_fakes(rows, faults, chat_model)
+    
+    start = time.perf_counter()
+    latencies = asyncio.run(run_sessions(0, args.sessions, args.concurrency))
+    flush_storage()
+    elapsed = time.perf_counter() - start
+    
+    result = {
+        "rows": rows,
+        "sessions": args.sessions,
+        "conversations_per_s": args.sessions / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "sheets_calls_per_lead": sheets.total_calls / args.sessions,
+        "llm_calls_per_lead": chat_model.calls / args.sessions,
+        "sheets_calls": dict(sheets.calls),
+    }
+    result["kib_per_session"] = asyncio.run(session_memory(args.sessions, args.memory_sessions)) / 1024
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", default="100,10000,100000,1000000", help="Comma-separated sheet sizes")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--memory-sessions", type=int, default=200)
+    parser.add_argument("--sheets-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected failure rate for both fakes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--partitioning", choices=["monthly"], help="Sheets partitioning; existing leads stay in the base worksheet")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per sheet size")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    if args.partitioning:
+        os.environ["SHEETS_PARTITIONING"] = args.partitioning
+    # Warm up imports and the shared graph before timing
+    new_session()
+    
+    if not args.json:
+        print(f"{'rows':>9} {'conv/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'sheets/lead':>12} {'llm/lead':>9} {'KiB/session':>12}")
+    
+    for rows in (int(value) for value in args.rows.split(",")):
+        result = benchmark(rows, args)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(
+                f"{rows:>9} {result['conversations_per_s']:>9.1f} {result['p50_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['sheets_calls_per_lead']:>12.3f} "
+                f"{result['llm_calls_per_lead']:>9.3f} {result['kib_per_session']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+In-process stand-ins for the Google Sheets API and the chat model, with
+configurable latency and error injection, so benchmarks run offline.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from services.google_sheets import GoogleSheetsService
+from services.llm_router import LocalClassifierChatModel
+
+
+class FakeFaults:
+    """Latency and error injection shared by the fakes."""
+    
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+    
+    def http_error(self) -> HttpError:
+        return HttpError(httplib2.Response({"status": self.error_status}), b"injected error")
+
+
+class FakeRequest:
+    """Mimics googleapiclient's HttpRequest: ``execute`` runs the call."""
+    
+    def __init__(self, sheets: "FakeSheets", method_id: str, call):
+        self.sheets = sheets
+        self.methodId = method_id
+        self._call = call
+    
+    def execute(self, http=None, num_retries: int = 0) -> Dict[str, Any]:
+        if self.sheets.faults.latency:
+            time.sleep(self.sheets.faults.latency)
+        return self.run()
+    
+    async def aexecute(self) -> Dict[str, Any]:
+        if self.sheets.faults.latency:
+            await asyncio.sleep(self.sheets.faults.latency)
+        return self.run()
+    
+    def run(self) -> Dict[str, Any]:
+        faults = self.sheets.faults
+        with self.sheets.lock:
+            self.sheets.calls[self.methodId] = self.sheets.calls.get(self.methodId, 0) + 1
+            if faults.should_fail():
+                raise faults.http_error()
+            return self._call()
+
+
+class FakeSheets:
+    """
+    The subset of the Sheets v4 discovery client the service uses:
+    ``spreadsheets().get/batchUpdate`` (addSheet and updateCells) and
+    ``values().get/update/append``. ``rows`` is the first worksheet.
+    """
+    
+    RANGE_PATTERN = re.compile(r"^'?(.*?)'?!A(\d*):H(\d*)$")
+    
+    def __init__(self, rows: Optional[List[List[str]]] = None, faults: Optional[FakeFaults] = None):
+        self.rows: List[List[str]] = rows or []
+        # Worksheet title -> (sheet id, rows)
+        self.worksheets: Dict[str, tuple] = {"Leads": (0, self.rows)}
+        self.faults = faults or FakeFaults()
+        self.calls: Dict[str, int] = {}
+        self.lock = threading.Lock()
+    
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+    
+    def spreadsheets(self) -> "FakeSheets":
+        return self
+    
+    def values(self) -> "_FakeValues":
+        return _FakeValues(self)
+    
+    def get(self, spreadsheetId: str, **kwargs) -> FakeRequest:
+        return FakeRequest(
+            self, "sheets.spreadsheets.get",
+            lambda: {"sheets": [
+                {"properties": {"title": title, "sheetId": sheet_id}}
+                for title, (sheet_id, _) in self.worksheets.items()
+            ]}
+        )
+    
+    def batchUpdate(self, spreadsheetId: str, body: Dict[str, Any]) -> FakeRequest:
+        def call():
+            for request in body["requests"]:
+                if "addSheet" in request:
+                    properties = request["addSheet"]["properties"]
+                    if properties["title"] in self.worksheets:
+                        raise HttpError(httplib2.Response({"status": 400}), b"sheet already exists")
+                    self.worksheets[properties["title"]] = (properties["sheetId"], [])
+                elif "updateCells" in request:
+                    update = request["updateCells"]
+                    rows = next(rows for sheet_id, rows in self.worksheets.values() if sheet_id == update["start"]["sheetId"])
+                    cells = [[cell["userEnteredValue"]["stringValue"] for cell in row["values"]] for row in update["rows"]]
+                    rows[:len(cells)] = cells
+            return {"replies": []}
+        
+        return FakeRequest(self, "sheets.spreadsheets.batchUpdate", call)
+    
+    def parse_range(self, cell_range: str) -> tuple:
+        """Worksheet rows, first and last row of an A:H range."""
+        match = self.RANGE_PATTERN.match(cell_range)
+        start = int(match.group(2) or 1)
+        end = int(match.group(3)) if match.group(3) else None
+        return self.worksheets[match.group(1)][1], start, end
+
+
+class _FakeValues:
+    def __init__(self, sheets: FakeSheets):
+        self.sheets = sheets
+    
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> FakeRequest:
+        rows, start, end = self.sheets.parse_range(range)
+        
+        def call():
+            values = rows[start - 1:end]
+            return {"range": range, "values": values} if values else {"range": range}
+        
+        return FakeRequest(self.sheets, "sheets.spreadsheets.values.get", call)
+    
+    def update(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict[str, Any]) -> FakeRequest:
+        rows, start, _ = self.sheets.parse_range(range)
+        
+        def call():
+            while len(rows) < start - 1:
+                rows.append([])
+            rows[start - 1:start - 1 + len(body["values"])] = body["values"]
+            return {"updatedRows": len(body["values"])}
+        
+        return FakeRequest(self.sheets, "sheets.spreadsheets.values.update", call)
+    
+    def append(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict[str, Any], **kwargs) -> FakeRequest:
+        rows, _, _ = self.sheets.parse_range(range)
+        
+        def call():
+            first = len(rows) + 1
+            rows.extend(body["values"])
+            last = len(rows)
+            return {"updates": {"updatedRange": f"{range.split('!')[0]}!A{first}:H{last}", "updatedRows": last - first + 1}}
+        
+        return FakeRequest(self.sheets, "sheets.spreadsheets.values.append", call)
+
+
+class FakeAsyncSheetsClient:
+    """AsyncSheetsClient over a FakeSheets; latency is awaited, not slept."""
+    
+    def __init__(self, sheets: FakeSheets):
+        self.sheets = sheets
+        self.credentials = None
+    
+    async def get_spreadsheet(self, spreadsheet_id: str, fields: str) -> Dict[str, Any]:
+        return await self.sheets.get(spreadsheet_id).aexecute()
+    
+    async def get_values(self, spreadsheet_id: str, cell_range: str) -> Dict[str, Any]:
+        return await self.sheets.values().get(spreadsheet_id, cell_range).aexecute()
+    
+    async def append_values(self, spreadsheet_id: str, cell_range: str, values: List[List[str]], **kwargs) -> Dict[str, Any]:
+        body = {"values": values}
+        return await self.sheets.values().append(spreadsheet_id, cell_range, "RAW", body).aexecute()
+    
+    async def batch_update(self, spreadsheet_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self.sheets.batchUpdate(spreadsheet_id, {"requests": requests}).aexecute()
+
+
+class FakeCredentials:
+    valid = True
+    expired = False
+    refresh_token = None
+
+
+class FakeGoogleSheetsService(GoogleSheetsService):
+    """GoogleSheetsService wired to a FakeSheets instead of the real API."""
+    
+    def __init__(self, sheets: FakeSheets):
+        self._fake_sheets = sheets
+        super().__init__()
+    
+    def _initialize_client(self) -> None:
+        self.service = self._fake_sheets
+        self.credentials = FakeCredentials()
+        self.spreadsheet_id = "benchmark"
+        self.sheet_name = "Leads"
+        self._load_catalog()
+    
+    def _get_async_client(self) -> FakeAsyncSheetsClient:
+        return FakeAsyncSheetsClient(self._fake_sheets)
+
+
+class FakeChatModel(LocalClassifierChatModel):
+    """
+    Chat model that answers like the classification LLM (using the keyword
+    classifier) after a configurable delay, failing at a configurable rate.
+    """
+    
+    latency: float = 0.0
+    error_rate: float = 0.0
+    calls: int = 0
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        self._maybe_fail()
+        return super()._generate(messages, stop, run_manager, **kwargs)
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._maybe_fail()
+        return super()._generate(messages, stop, None, **kwargs)
+    
+    def _maybe_fail(self) -> None:
+        if self.error_rate and random.random() < self.error_rate:
+            raise RuntimeError("injected LLM error")
+
+
+def sheet_with_rows(count: int, headers: List[str]) -> List[List[str]]:
+    """A sheet with a header row and ``count`` distinct existing leads."""
+    rows = [list(headers)]
+    rows.extend(
+        ["Sí", "Corporativo", "$5,000.00", "Cliente", f"existing{i}@bench.test", "email", "Sí", "2024-01-01 00:00:00"]
+        for i in range(count)
+    )
+    return rows
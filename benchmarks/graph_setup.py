@@ -0,0 +1,63 @@
+"""
+Per-session setup cost: building and compiling the lead graph for every
+conversation vs. reusing the process-wide compiled graph.
+
+Also runs short scripted conversations (in-memory channel, no external
+services) with each strategy to show the effect at high request rates.
+
+Usage:
+    python benchmarks/graph_setup.py [--sessions N]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from channels.memory import QueueChannel  # noqa: E402
+from flow.graph import build_graph, new_session, run_conversation  # noqa: E402
+from models.state import create_initial_state  # noqa: E402
+
+
+# Corporate lead with an explicit answer, so no LLM or Sheets work is needed
+SCRIPT = ["1", "Conferencia anual", "5000", "Ana", "ana@empresa.com"]
+
+
+def rebuild_per_session():
+    return build_graph(), create_initial_state()
+
+
+def time_setup(factory, sessions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(sessions):
+        factory()
+    return (time.perf_counter() - start) / sessions
+
+
+async def time_conversations(factory, sessions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(sessions):
+        graph, state = factory()
+        await run_conversation(graph, state, QueueChannel(list(SCRIPT)))
+    return sessions / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+    
+    # Warm up imports and the shared graph before timing
+    new_session()
+    
+    for label, factory in (("rebuild", rebuild_per_session), ("shared", new_session)):
+        setup = time_setup(factory, args.sessions)
+        rate = asyncio.run(time_conversations(factory, args.sessions))
+        print(f"{label:>8}: setup {setup * 1e6:9.1f} us/session  {rate:8.1f} conversations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Startup benchmark: time to import the conversation graph vs. building
+the LLM and Sheets clients eagerly, as importing the services used to do.
+
+Each measurement runs in a fresh interpreter so module caches don't
+leak between samples.
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+LAZY_IMPORT = """
+import time
+start = time.perf_counter()
+import flow.graph
+print(time.perf_counter() - start)
+"""
+
+EAGER_INIT = """
+import time
+start = time.perf_counter()
+import flow.graph
+from services.google_sheets import sheets_service
+from services.llm_classifier import event_classifier
+event_classifier.get()
+sheets_service.get()
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    
+    for label, code in (("lazy import", LAZY_IMPORT), ("eager init", EAGER_INIT)):
+        samples = measure(code, args.runs)
+        print(
+            f"{label:>12}: median {statistics.median(samples) * 1000:8.1f} ms"
+            f"  min {min(samples) * 1000:8.1f} ms  ({args.runs} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
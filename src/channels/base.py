@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+from langchain_core.runnables import RunnableConfig
+
+from services.metrics import metrics
+
+
+class ConversationChannel(ABC):
+    """Input/output channel a conversation uses to talk to the user."""
+    
+    @abstractmethod
+    async def send(self, message: str) -> None:
+        """Show a message to the user."""
+    
+    @abstractmethod
+    async def receive(self, prompt: str = "") -> str:
+        """Show an optional prompt and wait for the user's next turn."""
+
+
+def get_channel(config: RunnableConfig) -> ConversationChannel:
+    """Return the channel a graph run was started with."""
+    channel = config["configurable"]["channel"]
+    if metrics.enabled:
+        from channels.timed import TimedChannel
+        return TimedChannel(channel)
+    return channel
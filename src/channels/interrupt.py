@@ -0,0 +1,31 @@
+from typing import List
+
+from langgraph.types import interrupt
+
+from channels.base import ConversationChannel
+
+
+class InterruptChannel(ConversationChannel):
+    """
+    Channel for checkpointed runs served one turn per request.
+    
+    Every ``receive`` pauses the graph with ``interrupt()``, handing the
+    messages produced since the previous turn to the caller; the run is
+    resumed later with ``Command(resume=<user text>)``, possibly in another
+    worker. On resume LangGraph replays the node up to the pending
+    interrupt, so the buffer is cleared each time an earlier turn's answer
+    is returned and only new messages are reported.
+    """
+    
+    def __init__(self):
+        self.messages: List[str] = []
+    
+    async def send(self, message: str) -> None:
+        self.messages.append(message)
+    
+    async def receive(self, prompt: str = "") -> str:
+        if prompt:
+            self.messages.append(prompt)
+        value = interrupt(list(self.messages))
+        self.messages.clear()
+        return value
@@ -0,0 +1,41 @@
+import asyncio
+from typing import List, Optional
+
+from channels.base import ConversationChannel
+
+
+class QueueChannel(ConversationChannel):
+    """
+    In-memory channel backed by asyncio queues.
+    
+    The conversation side uses ``send``/``receive``; whoever drives the
+    session (a server, a test, a benchmark) feeds user turns with
+    ``put_input`` and reads what the agent said with ``get_output``.
+    """
+    
+    def __init__(self, inputs: Optional[List[str]] = None):
+        self.inputs: asyncio.Queue = asyncio.Queue()
+        self.outputs: asyncio.Queue = asyncio.Queue()
+        for value in inputs or []:
+            self.inputs.put_nowait(value)
+    
+    async def send(self, message: str) -> None:
+        await self.outputs.put(message)
+    
+    async def receive(self, prompt: str = "") -> str:
+        if prompt:
+            await self.outputs.put(prompt)
+        return await self.inputs.get()
+    
+    async def put_input(self, value: str) -> None:
+        await self.inputs.put(value)
+    
+    async def get_output(self) -> str:
+        return await self.outputs.get()
+    
+    def drain_outputs(self) -> List[str]:
+        """Return every message produced so far without waiting."""
+        messages = []
+        while not self.outputs.empty():
+            messages.append(self.outputs.get_nowait())
+        return messages
@@ -0,0 +1,14 @@
+import asyncio
+
+from channels.base import ConversationChannel
+
+
+class StdinChannel(ConversationChannel):
+    """Channel bound to the terminal, used by the interactive CLI."""
+    
+    async def send(self, message: str) -> None:
+        print(message)
+    
+    async def receive(self, prompt: str = "") -> str:
+        # input() blocks, so it runs in a worker thread to keep the loop free
+        return await asyncio.to_thread(input, prompt)
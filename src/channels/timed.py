@@ -0,0 +1,22 @@
+import time
+
+from channels.base import ConversationChannel
+from services.metrics import metrics
+
+
+class TimedChannel(ConversationChannel):
+    """Wraps a channel to record how long each reply from the user takes."""
+    
+    def __init__(self, channel: ConversationChannel):
+        self.channel = channel
+    
+    async def send(self, message: str) -> None:
+        await self.channel.send(message)
+    
+    async def receive(self, prompt: str = "") -> str:
+        started = time.perf_counter()
+        # Only completed waits are recorded; an interrupting channel raises
+        # here and the reply arrives in a later run
+        text = await self.channel.receive(prompt)
+        metrics.observe("lead_user_wait_seconds", time.perf_counter() - started)
+        return text
@@ -9,6 +9,103 @@ MIN_BUDGET = 1000.0
 
 MIN_EMAIL_LENGTH = 5
 MIN_PHONE_DIGITS = 7
+# International numbers can be up to 15 digits (E.164)
+MAX_PHONE_DIGITS = 15
+
+# LLM classification configuration
+LLM_CONFIG = {
+    "model": "gpt-3.5-turbo",
+    "temperature": 0.1,
+    # Answers are one word; this also bounds the cost of a runaway reply
+    "max_tokens": 8,
+    # classify_events: requests in flight and descriptions read per chunk
+    "batch_max_concurrency": 8,
+    "batch_chunk_size": 500,
+    # Chat backends behind the router (env: LLM_BACKENDS, comma separated):
+    # "openai:<model>" or "local" (offline keyword stand-in, tried last).
+    # None means just "openai:<model>".
+    "backends": None,
+    # Rolling window of requests kept per backend for p50/p95/error rate
+    "router_window": 200,
+    "router_max_error_rate": 0.5,
+    "router_unhealthy_cooldown_seconds": 30.0,
+    "router_max_workers": 32,
+    # Send a second request when the first token is later than the
+    # backend's p95 (and at least hedge_min_delay_seconds)
+    "hedge_requests": True,
+    "hedge_min_delay_seconds": 1.0,
+    # Conversations that never reach qualification drop their background
+    # classification after this long
+    "speculation_ttl_seconds": 900,
+    # Concurrent classifications are sent together, as one JSON-array
+    # request, after waiting at most this long for companions (0 disables)
+    "micro_batch_window_seconds": 0.02,
+    "micro_batch_max_size": 16,
+    "micro_batch_tokens_per_item": 16
+}
+
+# Connection pools shared by the OpenAI and Google API clients
+HTTP_CONFIG = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry_seconds": 60.0,
+    "timeout_seconds": 30.0,
+    # Where the Sheets discovery document is kept when the client library
+    # does not bundle it (defaults to src/data)
+    "discovery_cache_dir": None
+}
+
+# Instrumentation (env: METRICS_ENABLED, METRICS_OTEL); rendered at /metrics
+METRICS_CONFIG = {
+    "enabled": False,
+    # Also open OpenTelemetry spans (needs opentelemetry-api)
+    "otel": False,
+    "histogram_buckets": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+}
+
+# Prompt files in src/prompts are re-read when they change on disk;
+# this is how often each one is checked
+PROMPT_CONFIG = {
+    "reload_check_seconds": 2.0
+}
+
+# Keyword pre-classifier that answers obvious descriptions without the LLM
+LOCAL_CLASSIFIER_CONFIG = {
+    "min_confidence": 0.8,
+    # Lower bar used when the LLM is not available
+    "offline_min_confidence": 0.5
+}
+
+CLASSIFICATION_CACHE_CONFIG = {
+    "max_entries": 10000,
+    "ttl_seconds": 7 * 24 * 3600,
+    # Optional SQLite file shared across restarts (env: CLASSIFICATION_CACHE_PATH)
+    "sqlite_path": None
+}
+
+# Headless batch qualification (main.py batch)
+BATCH_CONFIG = {
+    "chunk_size": 1000
+}
+
+# Lead storage backend (env: LEAD_STORAGE_BACKEND, LEAD_STORAGE_PATH)
+STORAGE_CONFIG = {
+    # "sheets", "sqlite", or "sqlite+sheets" (SQLite with Sheets as an async replica)
+    "backend": "sheets",
+    # Defaults to src/data/leads.db
+    "sqlite_path": None,
+    "replication_interval_seconds": 5.0,
+    "replication_batch_size": 500
+}
+
+# HTTP/WebSocket server (main.py serve; env: CHECKPOINTER, CHECKPOINT_PATH)
+SERVER_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8000,
+    # "memory" (single process) or "sqlite" (shared by every worker on the host)
+    "checkpointer": "memory",
+    "checkpoint_path": "checkpoints.db"
+}
 
 # Google Sheets configuration
 SHEETS_CONFIG = {
@@ -23,7 +120,30 @@ SHEETS_CONFIG = {
         "Tipo de Contacto",
         "Calificado",
         "Fecha de Registro"
-    ]
+    ],
+    # Minimum seconds between reads of rows added outside this process
+    "index_revision_check_seconds": 30,
+    # Full reload of the lead table mirror, for rows edited or deleted by hand
+    "mirror_full_resync_seconds": 900,
+    # Batched writer: flush after this many queued leads or seconds
+    "write_batch_size": 100,
+    "write_flush_interval_seconds": 1.0,
+    # Client-side limiter sized to the Sheets per-user quota (60 requests/min)
+    "quota_requests_per_minute": 60,
+    "quota_burst": 10,
+    # Retries for 429/5xx and network errors, with full-jitter backoff
+    "max_retries": 5,
+    "retry_base_delay_seconds": 1.0,
+    "retry_max_delay_seconds": 64.0,
+    # Rows that still fail are kept here and replayed in the background
+    "outbox_path": None,
+    "outbox_drain_interval_seconds": 30.0,
+    # Replays Sheets may reject (400/403/404) before a row is dead-lettered
+    "outbox_max_attempts": 5,
+    # Lead table partitioning (env: SHEETS_PARTITIONING): None keeps every
+    # lead in the first worksheet; "monthly" writes each month to its own
+    # worksheet ("Leads 2026-10"), created on demand
+    "partitioning": None
 }
 
 MESSAGES = {
@@ -64,5 +184,7 @@ ERROR_MESSAGES = {
     "provide_description": "Por favor, proporciona una descripción del evento.",
     "invalid_event_option": "Por favor, selecciona una opción válida (1/2/3 o sí/no/describir).",
     "invalid_contact": "Por favor, ingresa un email válido (ej: usuario@ejemplo.com) o un teléfono válido (ej: +1234567890).",
+    "invalid_record": "Registro inválido en la línea {line}: no es un objeto JSON.",
+    "invalid_field": "Registro inválido: el campo {field} debe ser texto.",
     "llm_classification_error": "Error en clasificación LLM: {error}"
 }
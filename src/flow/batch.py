@@ -0,0 +1,245 @@
+"""
+Headless lead qualification over CSV/JSONL files.
+
+Records are streamed from the input file in chunks, so memory use does
+not depend on the file size. Each record goes through the same steps as
+an interactive conversation (contact detection, classification and the
+qualification rules) without any prompts.
+
+Input fields (CSV header or JSON keys):
+    is_corporate       optional; sí/si/yes/true/1 or no/false/0
+    event_type         event type, or the description to classify
+    event_description  optional free-text description to classify
+    budget             budget in USD
+    name               contact name
+    contact            email or phone
+"""
+
+import csv
+import json
+import math
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from config import BATCH_CONFIG, ERROR_MESSAGES
+from flow.qualification import check_qualification
+from models.state import LeadState
+from services.lead_storage import flush_storage, is_storage_available, save_leads_to_storage
+from services.llm_classifier import classify_events_with_llm, is_llm_available
+from services.local_classifier import classify_event_locally
+from utils.validators import detect_contact_type
+
+
+RESULT_FIELDS = [
+    "is_corporate", "event_type", "budget", "name",
+    "contact", "contact_type", "qualified", "valid", "message"
+]
+
+# Set on records that could not be read; parse_lead_record reports them as invalid
+RECORD_ERROR_KEY = "_error"
+
+# Free-text fields; anything but a string (or nothing) makes the record invalid
+TEXT_FIELDS = ("event_type", "event_description", "name")
+
+TRUE_VALUES = {"sí", "si", "yes", "y", "true", "1"}
+FALSE_VALUES = {"no", "n", "false", "0"}
+
+
+def read_lead_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records one at a time from a .csv or .jsonl file.
+    
+    A JSONL line that is not a JSON object still yields a record, carrying
+    only RECORD_ERROR_KEY, so one bad line does not abort the run.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if Path(path).suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                if not isinstance(record, dict):
+                    record = {RECORD_ERROR_KEY: ERROR_MESSAGES["invalid_record"].format(line=line_number)}
+                yield record
+
+
+def parse_lead_record(record: Dict[str, Any]) -> tuple[LeadState, Optional[str], Optional[str]]:
+    """
+    Turn a raw record into a lead state.
+    
+    Returns:
+        Tuple of (state, description, error) where description is the text
+        still to classify (None if the record states is_corporate) and error
+        is a validation message for records that cannot be qualified
+    """
+    state: LeadState = {
+        "is_corporate": None,
+        "event_type": _text_field(record, "event_type") or None,
+        "event_description": _text_field(record, "event_description") or None,
+        "budget": None,
+        "name": _text_field(record, "name"),
+        "contact": None,
+        "contact_type": None,
+        "qualified": False
+    }
+    
+    if RECORD_ERROR_KEY in record:
+        return state, None, record[RECORD_ERROR_KEY]
+    
+    for field in TEXT_FIELDS:
+        if record.get(field) is not None and not isinstance(record[field], str):
+            return state, None, ERROR_MESSAGES["invalid_field"].format(field=field)
+    
+    contact_type, contact = detect_contact_type(str(record.get("contact") or ""))
+    if contact_type == "invalid":
+        return state, None, ERROR_MESSAGES["invalid_contact"]
+    state["contact"] = contact
+    state["contact_type"] = contact_type
+    
+    try:
+        budget = float(str(record.get("budget")).strip())
+    except ValueError:
+        return state, None, ERROR_MESSAGES["invalid_number"]
+    if not math.isfinite(budget):
+        return state, None, ERROR_MESSAGES["invalid_number"]
+    # Same floor as the interactive budget question
+    if budget < 0.0:
+        return state, None, ERROR_MESSAGES["min_value"].format(min_value=0.0)
+    state["budget"] = budget
+    
+    is_corporate = str(record.get("is_corporate") or "").strip().lower()
+    if is_corporate in TRUE_VALUES:
+        state["is_corporate"] = True
+        return state, None, None
+    if is_corporate in FALSE_VALUES:
+        state["is_corporate"] = False
+        return state, None, None
+    
+    description = state["event_description"] or state["event_type"] or ""
+    if not description:
+        return state, None, ERROR_MESSAGES["provide_description"]
+    
+    return state, description, None
+
+
+def _text_field(record: Dict[str, Any], field: str) -> str:
+    value = record.get(field)
+    return value.strip() if isinstance(value, str) else ""
+
+
+def qualify_records(
+    records: Iterable[Dict[str, Any]],
+    chunk_size: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Qualify records and yield one result row per record, in input order.
+    
+    Descriptions the local classifier is not sure about are sent to the
+    LLM together, one batch per chunk.
+    """
+    chunk_size = chunk_size or BATCH_CONFIG["chunk_size"]
+    llm_available = is_llm_available()
+    iterator = iter(records)
+    
+    while chunk := list(islice(iterator, chunk_size)):
+        parsed = [parse_lead_record(record) for record in chunk]
+        needs_llm = []
+        
+        for index, (state, description, error) in enumerate(parsed):
+            if error or description is None:
+                continue
+            
+            local = classify_event_locally(description)
+            if local.is_confident(llm_available):
+                state["is_corporate"] = local.is_corporate
+                state["event_type"] = local.event_type
+            elif llm_available:
+                needs_llm.append(index)
+        
+        if needs_llm:
+            descriptions = [parsed[index][1] for index in needs_llm]
+            for index, (is_corporate, event_type) in zip(needs_llm, classify_events_with_llm(descriptions)):
+                state = parsed[index][0]
+                state["is_corporate"] = is_corporate
+                state["event_type"] = event_type or state["event_type"]
+        
+        for state, _, error in parsed:
+            state["event_type"] = state["event_type"] or "No especificado"
+            if error:
+                message = error
+            else:
+                state["qualified"], message = check_qualification(state)
+            yield {**state, "valid": error is None, "message": message.strip()}
+
+
+class LeadFileWriter:
+    """Writes result rows to a .csv or .jsonl file, one chunk at a time."""
+    
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if Path(path).suffix.lower() == ".csv":
+            # Rows also carry the lead state's other fields (event_description)
+            self._csv = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+    
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_batch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    store: bool = False,
+    chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Qualify every lead in a file and write the results.
+    
+    Args:
+        input_path: .csv or .jsonl file with one lead per record
+        output_path: Optional .csv or .jsonl file for the result rows
+        store: Also save valid leads to the configured lead storage
+        chunk_size: Records processed and written per chunk
+        
+    Returns:
+        Counts of processed, qualified, invalid and newly stored records
+    """
+    chunk_size = chunk_size or BATCH_CONFIG["chunk_size"]
+    writer = LeadFileWriter(output_path) if output_path else None
+    summary = {"processed": 0, "qualified": 0, "invalid": 0, "stored": 0}
+    
+    store = store and is_storage_available()
+    
+    try:
+        results = qualify_records(read_lead_records(input_path), chunk_size)
+        while chunk := list(islice(results, chunk_size)):
+            if writer is not None:
+                writer.write_rows(chunk)
+            
+            summary["processed"] += len(chunk)
+            summary["qualified"] += sum(row["qualified"] for row in chunk)
+            summary["invalid"] += sum(not row["valid"] for row in chunk)
+            
+            if store:
+                leads = [{key: row[key] for key in LeadState.__annotations__} for row in chunk if row["valid"]]
+                summary["stored"] += sum(save_leads_to_storage(leads))
+    finally:
+        if writer is not None:
+            writer.close()
+        if store:
+            flush_storage()
+    
+    return summary
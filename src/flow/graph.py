@@ -1,8 +1,19 @@
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph
-from models.state import LeadState
-from config import MIN_BUDGET, MESSAGES, ERROR_MESSAGES
-from services.llm_classifier import classify_event_with_llm, is_llm_available
-from services.google_sheets import save_lead_to_sheets, is_sheets_available
+from channels.base import ConversationChannel, get_channel
+from models.state import LeadState, create_initial_state
+from config import MESSAGES
+from flow.qualification import check_qualification
+from flow.speculation import conversation_key, speculator
+from services.llm_classifier import is_llm_available
+from services.local_classifier import classify_event_locally
+from services.lead_storage import asave_lead_to_storage, is_storage_available
+from services.metrics import instrument_node
 from utils.validators import (
     collect_string, 
     collect_float, 
@@ -12,33 +23,41 @@ from utils.validators import (
 )
 
 
-def collect_event_type(state: LeadState) -> LeadState:
-    print(MESSAGES["welcome"])
-    choice, description = collect_yes_no_describe()
+async def collect_event_type(state: LeadState, config: RunnableConfig) -> LeadState:
+    channel = get_channel(config)
+    await channel.send(MESSAGES["welcome"])
+    choice, description = await collect_yes_no_describe(channel)
     
     if choice == "yes":
         state["is_corporate"] = True
         # Ask user for specific corporate event type
-        state["event_type"] = input(MESSAGES["corporate_event_type_input"]).strip()
+        state["event_type"] = (await channel.receive(MESSAGES["corporate_event_type_input"])).strip()
     elif choice == "no":
         state["is_corporate"] = False
         # Ask user for specific event type
-        state["event_type"] = input(MESSAGES["event_type_input"]).strip()
+        state["event_type"] = (await channel.receive(MESSAGES["event_type_input"])).strip()
     elif choice == "describe":
-        if is_llm_available():
-            print(MESSAGES["analyzing_description"])
-            is_corporate, event_type = classify_event_with_llm(description)
-            state["is_corporate"] = is_corporate
-            state["event_type"] = event_type or "No especificado"
+        local = classify_event_locally(description)
+        llm_available = is_llm_available()
+        
+        if local.is_confident(llm_available):
+            state["is_corporate"] = local.is_corporate
+            state["event_type"] = local.event_type
             
-            if is_corporate:
-                print(MESSAGES["description_corporate"])
+            if local.is_corporate:
+                await channel.send(MESSAGES["description_corporate"])
             else:
-                print(MESSAGES["description_not_corporate"])
+                await channel.send(MESSAGES["description_not_corporate"])
+        elif llm_available:
+            # Classified in the background while budget and contact are
+            # collected; joined in evaluate_qualification
+            state["event_description"] = description
+            speculator.start(conversation_key(config), description)
         else:
-            print(MESSAGES["llm_unavailable"])
-            print(MESSAGES["manual_classification_prompt"])
-            manual_choice = collect_choice(
+            await channel.send(MESSAGES["llm_unavailable"])
+            await channel.send(MESSAGES["manual_classification_prompt"])
+            manual_choice = await collect_choice(
+                channel,
                 "¿Es corporativo? (sí/no)",
                 choices=["sí", "si", "yes", "no", "n"],
                 case_sensitive=False
@@ -47,74 +66,76 @@ def collect_event_type(state: LeadState) -> LeadState:
             state["is_corporate"] = is_corporate
             
             if is_corporate:
-                state["event_type"] = input(MESSAGES["corporate_event_type_input"]).strip()
+                state["event_type"] = (await channel.receive(MESSAGES["corporate_event_type_input"])).strip()
             else:
-                state["event_type"] = input(MESSAGES["event_type_input"]).strip()
+                state["event_type"] = (await channel.receive(MESSAGES["event_type_input"])).strip()
     
     return state
 
 
-def collect_budget(state: LeadState) -> LeadState:
-    print(MESSAGES["budget_question"])
-    state["budget"] = collect_float("Respuesta", min_value=0.0)
+async def collect_budget(state: LeadState, config: RunnableConfig) -> LeadState:
+    channel = get_channel(config)
+    await channel.send(MESSAGES["budget_question"])
+    state["budget"] = await collect_float(channel, "Respuesta", min_value=0.0)
     return state
 
 
-def collect_contact_info(state: LeadState) -> LeadState:
-    print(MESSAGES["contact_question"])
-    state["name"] = collect_string("Nombre")
+async def collect_contact_info(state: LeadState, config: RunnableConfig) -> LeadState:
+    channel = get_channel(config)
+    await channel.send(MESSAGES["contact_question"])
+    state["name"] = await collect_string(channel, "Nombre")
     
-    contact_value, contact_type = collect_contact_with_detection()
+    contact_value, contact_type = await collect_contact_with_detection(channel)
     state["contact"] = contact_value
     state["contact_type"] = contact_type
     
     return state
 
 
-def evaluate_qualification(state: LeadState) -> LeadState:
-    print(MESSAGES["evaluation_header"])
+async def evaluate_qualification(state: LeadState, config: RunnableConfig) -> LeadState:
+    channel = get_channel(config)
     
-    is_corporate = state["is_corporate"]
-    event_type = state["event_type"]
-    budget = state["budget"]
-    name = state["name"]
-    contact = state["contact"]
-    contact_type = state["contact_type"]
+    if state["is_corporate"] is None and state.get("event_description"):
+        classification = speculator.take(conversation_key(config), state["event_description"])
+        if not classification.done():
+            await channel.send(MESSAGES["analyzing_description"])
+        is_corporate, event_type = await classification
+        state["is_corporate"] = is_corporate
+        state["event_type"] = event_type or "No especificado"
+        
+        if is_corporate:
+            await channel.send(MESSAGES["description_corporate"])
+        else:
+            await channel.send(MESSAGES["description_not_corporate"])
     
-    if not is_corporate:
-        print(ERROR_MESSAGES["not_corporate"])
-        state["qualified"] = False
-    elif budget < MIN_BUDGET:
-        print(ERROR_MESSAGES["insufficient_budget"].format(min_budget=MIN_BUDGET))
-        state["qualified"] = False
-    elif not name.strip():
-        print(ERROR_MESSAGES["missing_name"])
-        state["qualified"] = False
-    elif not contact.strip():
-        print(ERROR_MESSAGES["missing_contact"])
-        state["qualified"] = False
-    else:
-        print(MESSAGES["qualified_success"])
-        state["qualified"] = True
+    await channel.send(MESSAGES["evaluation_header"])
+    
+    qualified, message = check_qualification(state)
+    await channel.send(message)
+    state["qualified"] = qualified
     
     return state
 
 
-def save_lead_data(state: LeadState) -> LeadState:
-    if is_sheets_available():
-        save_lead_to_sheets(state)
+async def save_lead_data(state: LeadState) -> LeadState:
+    if await asyncio.to_thread(is_storage_available):
+        await asave_lead_to_storage(state)
     
     return state
 
 
-def build_graph() -> StateGraph:
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
     workflow = StateGraph(LeadState)
     
-    workflow.add_node("collect_event_type", collect_event_type)
-    workflow.add_node("collect_budget", collect_budget)
-    workflow.add_node("collect_contact_info", collect_contact_info)
-    workflow.add_node("evaluate_qualification", evaluate_qualification)
-    workflow.add_node("save_lead_data", save_lead_data)
+    nodes = {
+        "collect_event_type": collect_event_type,
+        "collect_budget": collect_budget,
+        "collect_contact_info": collect_contact_info,
+        "evaluate_qualification": evaluate_qualification,
+        "save_lead_data": save_lead_data
+    }
+    for name, node in nodes.items():
+        workflow.add_node(name, instrument_node(name, node))
     
     workflow.set_entry_point("collect_event_type")
     
@@ -123,4 +144,37 @@ def build_graph() -> StateGraph:
     workflow.add_edge("collect_contact_info", "evaluate_qualification")
     workflow.add_edge("evaluate_qualification", "save_lead_data")
     
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
+
+
+_compiled_graphs: Dict[int, Tuple[Optional[BaseCheckpointSaver], StateGraph]] = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def get_compiled_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Return the process-wide compiled graph for a checkpointer.
+    
+    The graph is built and validated once; compiled graphs are safe to
+    share between concurrent sessions.
+    """
+    key = id(checkpointer)
+    entry = _compiled_graphs.get(key)
+    if entry is None:
+        with _compiled_graphs_lock:
+            entry = _compiled_graphs.get(key)
+            if entry is None:
+                # The checkpointer is kept in the entry so its id is never reused
+                entry = (checkpointer, build_graph(checkpointer))
+                _compiled_graphs[key] = entry
+    return entry[1]
+
+
+def new_session(checkpointer: Optional[BaseCheckpointSaver] = None) -> Tuple[StateGraph, LeadState]:
+    """Return the shared compiled graph and a fresh state for one conversation."""
+    return get_compiled_graph(checkpointer), create_initial_state()
+
+
+async def run_conversation(graph, state: LeadState, channel: ConversationChannel) -> LeadState:
+    """Run one conversation through the compiled graph over the given channel."""
+    return await graph.ainvoke(state, config={"configurable": {"channel": channel}})
\ No newline at end of file
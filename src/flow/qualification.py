@@ -0,0 +1,24 @@
+from config import MIN_BUDGET, MESSAGES, ERROR_MESSAGES
+from models.state import LeadState
+
+
+def check_qualification(state: LeadState) -> tuple[bool, str]:
+    """
+    Apply the qualification rules to a completed lead.
+    
+    Args:
+        state: Lead with classification, budget and contact filled in
+        
+    Returns:
+        Tuple of (qualified, message) where message is the text shown to the user
+    """
+    if not state["is_corporate"]:
+        return False, ERROR_MESSAGES["not_corporate"]
+    elif state["budget"] < MIN_BUDGET:
+        return False, ERROR_MESSAGES["insufficient_budget"].format(min_budget=MIN_BUDGET)
+    elif not state["name"].strip():
+        return False, ERROR_MESSAGES["missing_name"]
+    elif not state["contact"].strip():
+        return False, ERROR_MESSAGES["missing_contact"]
+    
+    return True, MESSAGES["qualified_success"]
@@ -0,0 +1,81 @@
+"""
+Background LLM classification for conversations.
+
+When a description needs the LLM, the classification starts as soon as
+the description is known and runs while the budget and contact questions
+are asked; the graph joins it at qualification time, so the LLM round
+trip overlaps the user's think time instead of adding to it.
+"""
+
+import asyncio
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+
+from config import LLM_CONFIG
+from services.llm_classifier import aclassify_event_with_llm
+
+
+Classification = Tuple[Optional[bool], Optional[str]]
+
+
+def conversation_key(config: RunnableConfig) -> Hashable:
+    """The checkpointer thread if there is one, else the channel of the run."""
+    configurable = config["configurable"]
+    return configurable.get("thread_id") or configurable["channel"]
+
+
+class ClassificationSpeculator:
+    """In-flight classifications, one per conversation."""
+    
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._pending: Dict[Hashable, Tuple["asyncio.Task[Classification]", float]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def start(self, key: Hashable, description: str) -> None:
+        """Start classifying ``description`` in the background."""
+        self._expire()
+        self._discard(key)
+        task = asyncio.ensure_future(aclassify_event_with_llm(description))
+        self._pending[key] = (task, time.monotonic())
+    
+    def take(self, key: Hashable, description: str) -> "asyncio.Future[Classification]":
+        """
+        Hand over the classification started for ``key``.
+        
+        If there is none on this loop (the process restarted between turns,
+        or it expired), the description is classified now instead.
+        """
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            task, _ = entry
+            if task.get_loop() is asyncio.get_running_loop():
+                return task
+            self._cancel(task)
+        return asyncio.ensure_future(aclassify_event_with_llm(description))
+    
+    def _discard(self, key: Hashable) -> None:
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            self._cancel(entry[0])
+    
+    @staticmethod
+    def _cancel(task: "asyncio.Task[Classification]") -> None:
+        # The task may belong to another loop, which may be closed already
+        try:
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            pass
+    
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self.ttl_seconds
+        for key in [key for key, (_, started) in self._pending.items() if started < deadline]:
+            self._discard(key)
+
+
+# Global instance
+speculator = ClassificationSpeculator(LLM_CONFIG["speculation_ttl_seconds"])
@@ -1,23 +1,79 @@
-from models.state import LeadState
-from flow.graph import build_graph
+import argparse
+import asyncio
+import json
+import os
+
+from channels.stdin import StdinChannel
+from config import SERVER_CONFIG
+from flow.graph import new_session, run_conversation
+from services.google_sheets import prewarm_sheets_service
+from services.llm_classifier import prewarm_llm_classifier
 
 
 def run_cli():
     """Run the lead qualification workflow via CLI."""
-    graph = build_graph()
+    # Build the external clients while the user answers the first question
+    prewarm_llm_classifier()
+    prewarm_sheets_service()
+    
+    graph, initial_state = new_session()
+    
+    final_state = asyncio.run(run_conversation(graph, initial_state, StdinChannel()))
+
+
+def run_batch_cli(args: argparse.Namespace) -> None:
+    """Qualify the leads in a CSV/JSONL file without prompts."""
+    from flow.batch import run_batch
+    
+    summary = run_batch(args.input, args.output, store=args.store, chunk_size=args.chunk_size)
+    print(json.dumps(summary))
+
+
+def run_server(args: argparse.Namespace) -> None:
+    """Serve conversations over HTTP/WebSocket."""
+    import uvicorn
+    
+    # Workers are separate processes; they pick these up in create_app()
+    os.environ["CHECKPOINTER"] = args.checkpointer
+    os.environ["CHECKPOINT_PATH"] = args.checkpoint_path
+    
+    uvicorn.run(
+        "server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lead qualification agent")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch_parser = subparsers.add_parser("batch", help="qualify leads from a CSV/JSONL file")
+    batch_parser.add_argument("input", help="input .csv or .jsonl file")
+    batch_parser.add_argument("-o", "--output", help="output .csv or .jsonl file")
+    batch_parser.add_argument("--store", action="store_true", help="also save valid leads to the lead storage")
+    batch_parser.add_argument("--chunk-size", type=int, default=None)
+    
+    serve_parser = subparsers.add_parser("serve", help="serve conversations over HTTP/WebSocket")
+    serve_parser.add_argument("--host", default=SERVER_CONFIG["host"])
+    serve_parser.add_argument("--port", type=int, default=SERVER_CONFIG["port"])
+    serve_parser.add_argument("--workers", type=int, default=1)
+    serve_parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default=SERVER_CONFIG["checkpointer"])
+    serve_parser.add_argument("--checkpoint-path", default=SERVER_CONFIG["checkpoint_path"])
     
-    initial_state: LeadState = {
-        "is_corporate": None,
-        "event_type": None,
-        "budget": None,
-        "name": None,
-        "contact": None,
-        "contact_type": None,
-        "qualified": None
-    }
+    args = parser.parse_args()
     
-    final_state = graph.invoke(initial_state)
+    if args.command == "batch":
+        run_batch_cli(args)
+    elif args.command == "serve":
+        if args.workers > 1 and args.checkpointer == "memory":
+            parser.error("--workers > 1 needs --checkpointer sqlite so workers share sessions")
+        run_server(args)
+    else:
+        run_cli()
 
 
 if __name__ == "__main__":
-    run_cli()
\ No newline at end of file
+    main()
\ No newline at end of file
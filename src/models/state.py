@@ -5,9 +5,25 @@ class LeadState(TypedDict):
     """State for lead qualification workflow."""
     is_corporate: Optional[bool]
     event_type: Optional[str]
+    # Set while an LLM classification of it is pending
+    event_description: Optional[str]
     budget: Optional[float]
     name: Optional[str]
     contact: Optional[str]
     contact_type: Optional[str]  
     qualified: Optional[bool]
 
+
+
+def create_initial_state() -> LeadState:
+    """Return an empty lead state for a new conversation."""
+    return {
+        "is_corporate": None,
+        "event_type": None,
+        "event_description": None,
+        "budget": None,
+        "name": None,
+        "contact": None,
+        "contact_type": None,
+        "qualified": None
+    }
@@ -0,0 +1,193 @@
+"""
+HTTP/WebSocket front-end for the lead qualification graph.
+
+Each conversation is a LangGraph thread. Between user turns the graph is
+paused with interrupt() and its LeadState lives in the checkpointer, so a
+paused session costs one checkpoint and no coroutine, and any worker
+process that shares the checkpointer can resume it.
+
+Endpoints:
+    POST /sessions                  start a conversation
+    GET  /sessions/{session_id}     current turn of a conversation
+    POST /sessions/{session_id}     send the user's reply: {"text": "..."}
+    WS   /sessions/{session_id}/ws  the same conversation over a WebSocket;
+                                    use "new" as session_id to start one
+    GET  /metrics                   Prometheus metrics (with METRICS_ENABLED)
+"""
+
+import asyncio
+import os
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket
+
+from channels.interrupt import InterruptChannel
+from config import SERVER_CONFIG
+from flow.graph import get_compiled_graph
+from models.state import create_initial_state
+from services.metrics import render_metrics
+
+
+@asynccontextmanager
+async def open_checkpointer(kind: str, path: Optional[str]) -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Open the checkpointer sessions are stored in.
+    
+    "memory" keeps sessions in this process only; "sqlite" stores them in a
+    file every worker on the host can share.
+    """
+    if kind == "memory":
+        yield InMemorySaver()
+    elif kind == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError as e:
+            raise RuntimeError(
+                "The sqlite checkpointer needs the langgraph-checkpoint-sqlite package."
+            ) from e
+        
+        async with AsyncSqliteSaver.from_conn_string(path) as saver:
+            yield saver
+    else:
+        raise ValueError(f"Unknown checkpointer: {kind}")
+
+
+class ConversationSessions:
+    """Runs one user turn at a time for checkpointed conversations."""
+    
+    def __init__(self, graph):
+        self.graph = graph
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    
+    async def start(self) -> Dict[str, Any]:
+        session_id = uuid.uuid4().hex
+        return await self._run(session_id, create_initial_state())
+    
+    async def reply(self, session_id: str, text: str) -> Optional[Dict[str, Any]]:
+        """Resume a paused conversation with the user's answer; None if it is not waiting."""
+        async with self._lock(session_id):
+            snapshot = await self.graph.aget_state(self._config(session_id))
+            if not snapshot.interrupts:
+                return None
+            return await self._run(session_id, Command(resume=text))
+    
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = await self.graph.aget_state(self._config(session_id))
+        if not snapshot.values:
+            return None
+        
+        if snapshot.interrupts:
+            return self._turn(session_id, snapshot.interrupts[0].value, snapshot.values, done=False)
+        return self._turn(session_id, [], snapshot.values, done=True)
+    
+    async def _run(self, session_id: str, graph_input: Any) -> Dict[str, Any]:
+        channel = InterruptChannel()
+        result = await self.graph.ainvoke(graph_input, config=self._config(session_id, channel))
+        
+        interrupts = result.pop("__interrupt__", None)
+        if interrupts:
+            return self._turn(session_id, interrupts[0].value, result, done=False)
+        return self._turn(session_id, channel.messages, result, done=True)
+    
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+    
+    @staticmethod
+    def _config(session_id: str, channel: Optional[InterruptChannel] = None) -> Dict[str, Any]:
+        return {"configurable": {"thread_id": session_id, "channel": channel}}
+    
+    @staticmethod
+    def _turn(session_id: str, messages: list, state: Dict[str, Any], done: bool) -> Dict[str, Any]:
+        return {"session_id": session_id, "messages": messages, "done": done, "state": state}
+
+
+async def start_session(request: Request) -> JSONResponse:
+    return JSONResponse(await request.app.state.sessions.start(), status_code=201)
+
+
+async def get_session(request: Request) -> JSONResponse:
+    turn = await request.app.state.sessions.get(request.path_params["session_id"])
+    if turn is None:
+        return JSONResponse({"error": "session not found"}, status_code=404)
+    return JSONResponse(turn)
+
+
+async def reply_session(request: Request) -> JSONResponse:
+    body = await request.json()
+    text = body.get("text") if isinstance(body, dict) else None
+    if not isinstance(text, str):
+        return JSONResponse({"error": "expected {\"text\": \"...\"}"}, status_code=400)
+    
+    turn = await request.app.state.sessions.reply(request.path_params["session_id"], text)
+    if turn is None:
+        return JSONResponse({"error": "session not found or already finished"}, status_code=404)
+    return JSONResponse(turn)
+
+
+async def session_socket(websocket: WebSocket) -> None:
+    sessions: ConversationSessions = websocket.app.state.sessions
+    session_id = websocket.path_params["session_id"]
+    await websocket.accept()
+    
+    turn = await sessions.start() if session_id == "new" else await sessions.get(session_id)
+    if turn is None:
+        await websocket.send_json({"error": "session not found"})
+        await websocket.close(code=4404)
+        return
+    
+    await websocket.send_json(turn)
+    while not turn["done"]:
+        text = await websocket.receive_text()
+        turn = await sessions.reply(turn["session_id"], text)
+        if turn is None:
+            # Finished meanwhile, e.g. from another connection to the same session
+            await websocket.send_json({"error": "session not found or already finished"})
+            await websocket.close(code=4404)
+            return
+        await websocket.send_json(turn)
+    
+    await websocket.close()
+
+
+async def get_metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+def create_app() -> Starlette:
+    """
+    Build the ASGI app. Checkpointer settings come from the environment
+    (CHECKPOINTER, CHECKPOINT_PATH) so every uvicorn worker uses the same.
+    """
+    kind = os.getenv("CHECKPOINTER") or SERVER_CONFIG["checkpointer"]
+    path = os.getenv("CHECKPOINT_PATH") or SERVER_CONFIG["checkpoint_path"]
+    
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with open_checkpointer(kind, path) as checkpointer:
+            app.state.sessions = ConversationSessions(get_compiled_graph(checkpointer))
+            yield
+    
+    return Starlette(
+        routes=[
+            Route("/sessions", start_session, methods=["POST"]),
+            Route("/sessions/{session_id}", get_session, methods=["GET"]),
+            Route("/sessions/{session_id}", reply_session, methods=["POST"]),
+            WebSocketRoute("/sessions/{session_id}/ws", session_socket),
+            Route("/metrics", get_metrics, methods=["GET"]),
+        ],
+        lifespan=lifespan
+    )
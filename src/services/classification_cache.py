@@ -0,0 +1,150 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+Classification = Tuple[bool, str]
+
+
+def normalize_description(description: str) -> str:
+    """
+    Reduce a description to the form used for cache keys.
+    
+    Case, accents, surrounding punctuation and repeated whitespace are
+    dropped, so "Fiesta de fin de año " and "fiesta de fin de ano." share
+    a key.
+    """
+    decomposed = unicodedata.normalize("NFKD", description)
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    collapsed = " ".join(without_accents.lower().split())
+    return collapsed.strip(" .,;:!?¡¿\"'")
+
+
+def make_cache_key(description: str, model_name: str, template_hash: str) -> str:
+    raw = "\0".join((model_name, template_hash, normalize_description(description)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL."""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Classification]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Classification]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Classification, stored_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._entries[key] = (stored_at or time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Persistent classification store shared across restarts and workers."""
+    
+    def __init__(self, path: str, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS classifications ("
+            "key TEXT PRIMARY KEY, is_corporate INTEGER NOT NULL, "
+            "event_type TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+    
+    def get(self, key: str) -> Optional[Tuple[float, Classification]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT is_corporate, event_type, stored_at FROM classifications WHERE key = ?",
+                (key,)
+            ).fetchone()
+        
+        if row is None or time.time() - row[2] > self.ttl_seconds:
+            return None
+        
+        return row[2], (bool(row[0]), row[1])
+    
+    def set(self, key: str, value: Classification) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?)",
+                (key, int(value[0]), value[1], time.time())
+            )
+            self._connection.commit()
+
+
+class ClassificationCache:
+    """
+    Two-level cache for LLM classifications.
+    
+    Lookups hit the in-process LRU first and fall back to the optional
+    SQLite store, promoting persistent hits into memory.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, sqlite_path: Optional[str] = None):
+        self.memory = LRUCache(max_entries, ttl_seconds)
+        self.persistent = SQLiteCache(sqlite_path, ttl_seconds) if sqlite_path else None
+        self.hits = 0
+        self.misses = 0
+        # Sessions on several threads share the cache
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Classification]:
+        value = self.memory.get(key)
+        
+        if value is None and self.persistent is not None:
+            entry = self.persistent.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                self.memory.set(key, value, stored_at)
+        
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        return value
+    
+    def set(self, key: str, value: Classification) -> None:
+        self.memory.set(key, value)
+        if self.persistent is not None:
+            self.persistent.set(key, value)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "persistent": self.persistent is not None
+        }
@@ -1,18 +1,35 @@
+import asyncio
+import atexit
 import os
 import os.path
+import re
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 from pathlib import Path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from config import SHEETS_CONFIG
 from models.state import LeadState
+from services.lead_writer import BatchedLeadWriter
+from services.http_transport import get_google_http, load_sheets_discovery
+from services.metrics import metrics
+from services.registry import LazyService
+from services.sheets_async import AsyncSheetsClient
+from services.sheets_partitions import PartitionCatalog, SheetPartition
+from services.sheets_resilience import OutboxDrainer, SheetsOutbox, TokenBucket, execute_with_retry, is_retryable
+from services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class DuplicateLeadError(Exception):
+    """The contact is already in the sheet, or being written to it."""
 
 
 class GoogleSheetsService:
     SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+    REGISTERED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+    CATALOG_FIELDS = "sheets.properties(sheetId,title)"
     
     def __init__(self):
         self.service = None
@@ -21,9 +38,36 @@ class GoogleSheetsService:
         self.credentials = None
         self.SPREADSHEET_ID = "181M0QYYtFhEXB39Qal_htrYe5vI8hCFOdna3mglyGZQ"
         self.SHEET_NAME = "Leads"
+        self._catalog = PartitionCatalog(os.getenv("SHEETS_PARTITIONING") or SHEETS_CONFIG["partitioning"])
+        # Lock order: _catalog_lock, then _index_lock. The index lock only
+        # guards the mirrors and pending contacts and is never held across
+        # a Sheets call, so the partition a row goes to is resolved (and
+        # created) before it is taken.
+        self._catalog_lock = threading.Lock()
+        self._index_lock = threading.RLock()
+        self._pending_contacts: Set[Tuple[str, str]] = set()
+        self._writer: Optional[BatchedLeadWriter] = None
+        self._limiter = TokenBucket(
+            SHEETS_CONFIG["quota_requests_per_minute"] / 60,
+            SHEETS_CONFIG["quota_burst"]
+        )
+        self._outbox: Optional[SheetsOutbox] = None
+        self._drainer: Optional[OutboxDrainer] = None
+        self._async_client: Optional[AsyncSheetsClient] = None
+        self._reads = SingleFlight("sheets_read")
+        self._async_reads = AsyncSingleFlight("sheets_read")
         self._initialize_client()
+        
+        if self.service is not None and self.spreadsheet_id is not None:
+            self._open_outbox()
     
     def _initialize_client(self) -> None:
+        # Heavy client libraries are imported here so importing this module stays cheap
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from googleapiclient.discovery import build_from_document
+        
         try:
             creds = None
             token_path = Path(__file__).parent.parent / "credentials" / "token.json"
@@ -54,7 +98,7 @@ class GoogleSheetsService:
                     token.write(creds.to_json())
             
             self.credentials = creds
-            self.service = build("sheets", "v4", credentials=creds)
+            self.service = build_from_document(load_sheets_discovery(), credentials=creds)
             self._auto_configure_spreadsheet()
             
         except Exception:
@@ -68,6 +112,8 @@ class GoogleSheetsService:
         
         if not self.credentials.valid:
             if self.credentials.expired and self.credentials.refresh_token:
+                from google.auth.transport.requests import Request
+                
                 try:
                     self.credentials.refresh(Request())
                     # Save refreshed token
@@ -89,7 +135,7 @@ class GoogleSheetsService:
                 return
             
             sheet = self.service.spreadsheets()
-            spreadsheet_info = sheet.get(spreadsheetId=self.SPREADSHEET_ID).execute()
+            spreadsheet_info = self._execute(sheet.get(spreadsheetId=self.SPREADSHEET_ID))
             sheets = spreadsheet_info.get('sheets', [])
             
             if not sheets:
@@ -99,6 +145,8 @@ class GoogleSheetsService:
             
             self.spreadsheet_id = self.SPREADSHEET_ID
             self.sheet_name = first_sheet_name
+            self._catalog.load(sheets)
+            self._catalog.checked_at = time.monotonic()
             
             self._setup_elegant_headers()
             
@@ -109,10 +157,12 @@ class GoogleSheetsService:
     def _setup_elegant_headers(self) -> None:
         try:
             read_range = f"{self.sheet_name}!A1:H1"
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=read_range
-            ).execute()
+            result = self._execute(
+                self.service.spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=read_range
+                )
+            )
             
             values = result.get("values", [])
             
@@ -131,12 +181,14 @@ class GoogleSheetsService:
                 header_range = f"{self.sheet_name}!A1:H1"
                 body = {'values': [headers]}
                 
-                self.service.spreadsheets().values().update(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=header_range,
-                    valueInputOption='RAW',
-                    body=body
-                ).execute()
+                self._execute(
+                    self.service.spreadsheets().values().update(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=header_range,
+                        valueInputOption='RAW',
+                        body=body
+                    )
+                )
                 
                 self._format_headers()
                 
@@ -145,55 +197,59 @@ class GoogleSheetsService:
     
     def _format_headers(self) -> None:
         try:
-            requests = [
-                {
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": 0,
-                            "startRowIndex": 0,
-                            "endRowIndex": 1,
-                            "startColumnIndex": 0,
-                            "endColumnIndex": 8
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "backgroundColor": {
-                                    "red": 0.2,
-                                    "green": 0.4,
-                                    "blue": 0.8
-                                },
-                                "textFormat": {
-                                    "foregroundColor": {
-                                        "red": 1.0,
-                                        "green": 1.0,
-                                        "blue": 1.0
-                                    },
-                                    "fontSize": 12,
-                                    "bold": True
-                                },
-                                "horizontalAlignment": "CENTER"
-                            }
-                        },
-                        "fields": "userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)"
-                    }
-                }
-            ]
+            requests = [self._header_format_request(0)]
             
-            self.service.spreadsheets().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={"requests": requests}
-            ).execute()
+            self._execute(
+                self.service.spreadsheets().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={"requests": requests}
+                )
+            )
             
         except Exception:
             pass
     
+    @staticmethod
+    def _header_format_request(sheet_id: int) -> Dict[str, Any]:
+        return {
+            "repeatCell": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "startRowIndex": 0,
+                    "endRowIndex": 1,
+                    "startColumnIndex": 0,
+                    "endColumnIndex": 8
+                },
+                "cell": {
+                    "userEnteredFormat": {
+                        "backgroundColor": {
+                            "red": 0.2,
+                            "green": 0.4,
+                            "blue": 0.8
+                        },
+                        "textFormat": {
+                            "foregroundColor": {
+                                "red": 1.0,
+                                "green": 1.0,
+                                "blue": 1.0
+                            },
+                            "fontSize": 12,
+                            "bold": True
+                        },
+                        "horizontalAlignment": "CENTER"
+                    }
+                },
+                "fields": "userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)"
+            }
+        }
+    
     def set_spreadsheet_id(self, spreadsheet_id: str) -> bool:
         try:
             if not self.service:
                 return False
             
             sheet = self.service.spreadsheets()
-            spreadsheet_info = sheet.get(spreadsheetId=spreadsheet_id).execute()
+            spreadsheet_info = self._execute(sheet.get(spreadsheetId=spreadsheet_id))
             sheets = spreadsheet_info.get('sheets', [])
             
             if not sheets:
@@ -202,6 +258,12 @@ class GoogleSheetsService:
             first_sheet_name = sheets[0]['properties']['title']
             self.sheet_name = first_sheet_name
             self.spreadsheet_id = spreadsheet_id
+            self._catalog = PartitionCatalog(self._catalog.scheme)
+            self._catalog.load(sheets)
+            self._catalog.checked_at = time.monotonic()
+            
+            if self._outbox is None:
+                self._open_outbox()
             
             return True
             
@@ -222,6 +284,9 @@ class GoogleSheetsService:
             "spreadsheet_id_available": self.spreadsheet_id is not None,
             "sheet_name_available": self.sheet_name is not None,
             "fully_available": self.is_available(),
+            "outbox_pending": len(self._outbox) if self._outbox is not None else 0,
+            "outbox_dead_letters": len(self._outbox.dead_letters()) if self._outbox is not None else 0,
+            "partitions": [partition.title for partition in self._catalog.partitions()],
             "error_message": self._get_error_message()
         }
     
@@ -245,92 +310,457 @@ class GoogleSheetsService:
         if not self._ensure_valid_credentials():
             return False
         
-        try:
+        key = (state["contact"], state["contact_type"])
+        
+        self._try_sync_mirror()
+        with self._index_lock:
             if self._is_duplicate(state):
                 return False
-            
-            row_data = self._prepare_row_data(state)
-            
-            sheet = self.service.spreadsheets()
-            
-            read_range = f"{self.sheet_name}!A:H"
-            result = sheet.values().get(
-                spreadsheetId=self.spreadsheet_id, 
-                range=read_range
-            ).execute()
-            
-            values = result.get("values", [])
-            next_row = len(values) + 1 if values else 2
-            
-            write_range = f"{self.sheet_name}!A{next_row}:H{next_row}"
-            
-            body = {'values': [row_data]}
-            
-            write_result = (
-                sheet.values()
-                .update(
+            # Reserved while it is written, so a concurrent save of the same
+            # contact is still a duplicate without holding the lock meanwhile
+            self._pending_contacts.add(key)
+        
+        row = self._prepare_row_data(state)
+        try:
+            self._write_rows([row])
+        except Exception:
+            self._invalidate_mirror()
+            self._on_lead_written(key, row, False)
+            return False
+        
+        self._on_lead_written(key, row, True)
+        return True
+    
+    def submit_lead(self, state: LeadState, registered_at: Optional[datetime] = None) -> "Future[bool]":
+        """
+        Queue a lead on the batched writer instead of writing it inline.
+        
+        The duplicate check runs immediately against the contact index; the
+        returned future resolves to True once the row has been appended or
+        stored in the outbox, and to False if it was not accepted (Sheets
+        unavailable, writer closed, write failed). A duplicate fails it with
+        ``DuplicateLeadError`` instead, so it can be told apart from a lead
+        worth retrying. ``registered_at`` defaults to now; replicas pass the
+        time the lead was originally captured.
+        """
+        if not self.is_available() or not self._ensure_valid_credentials():
+            return self._resolved(False)
+        
+        self._try_sync_mirror()
+        return self._enqueue_lead(state, registered_at)
+    
+    async def asubmit_lead(self, state: LeadState) -> "Future[bool]":
+        """
+        ``submit_lead`` for callers on an event loop.
+        
+        The mirror read that the duplicate check may need goes through the
+        async client, and a token refresh runs in a thread, so the loop
+        keeps serving other sessions meanwhile. If the read fails, the
+        check runs against what is mirrored, like the sync path does.
+        """
+        if not self.service or not self.spreadsheet_id or self.sheet_name is None:
+            return self._resolved(False)
+        if not (self.credentials and self.credentials.valid):
+            # Refreshing the token is blocking HTTP
+            if not await asyncio.to_thread(self._ensure_valid_credentials):
+                return self._resolved(False)
+        
+        try:
+            await self._async_sync_mirror()
+        except Exception:
+            pass
+        return self._enqueue_lead(state)
+    
+    def _enqueue_lead(self, state: LeadState, registered_at: Optional[datetime] = None) -> "Future[bool]":
+        """Check the contact against the mirror and queue the row; no Sheets I/O."""
+        key = (state["contact"], state["contact_type"])
+        
+        with self._index_lock:
+            if self._is_duplicate(state):
+                future: "Future[bool]" = Future()
+                future.set_exception(DuplicateLeadError(key))
+                return future
+            self._pending_contacts.add(key)
+        
+        row = self._prepare_row_data(state, registered_at)
+        future = self._get_writer().submit(row)
+        future.add_done_callback(lambda f: self._on_lead_written(key, row, f.result()))
+        return future
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+    
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+    
+    def _get_writer(self) -> BatchedLeadWriter:
+        with self._index_lock:
+            if self._writer is None:
+                self._writer = BatchedLeadWriter(
+                    self._write_rows,
+                    batch_size=SHEETS_CONFIG["write_batch_size"],
+                    flush_interval=SHEETS_CONFIG["write_flush_interval_seconds"]
+                )
+                atexit.register(self.close)
+            return self._writer
+    
+    def _on_lead_written(self, key: Tuple[str, str], row: List[str], written: bool) -> None:
+        with self._index_lock:
+            self._pending_contacts.discard(key)
+            if written:
+                self._remember_contact(row, key)
+    
+    def _remember_contact(self, row: List[str], key: Tuple[str, str]) -> None:
+        # A row still in the outbox has no partition yet; any mirror will do
+        partitions = self._catalog.partitions()
+        partition = self._catalog.get(self._title_for_row(row)) or (partitions[0] if partitions else None)
+        if partition is not None:
+            partition.mirror.contacts.add(key)
+    
+    def _open_outbox(self) -> None:
+        path = (
+            os.getenv("SHEETS_OUTBOX_PATH")
+            or SHEETS_CONFIG["outbox_path"]
+            or str(Path(__file__).parent.parent / "data" / "sheets_outbox.db")
+        )
+        self._outbox = SheetsOutbox(path)
+        self._drainer = OutboxDrainer(
+            self._outbox,
+            self._append_rows,
+            interval=SHEETS_CONFIG["outbox_drain_interval_seconds"],
+            batch_size=SHEETS_CONFIG["write_batch_size"],
+            max_attempts=SHEETS_CONFIG["outbox_max_attempts"],
+            group_by=self._title_for_row
+        )
+    
+    def _write_rows(self, rows: List[List[str]]) -> None:
+        """
+        Append rows, falling back to the outbox when Sheets keeps failing.
+        
+        While the outbox holds rows, new ones are queued behind them so the
+        sheet keeps insertion order and callers don't wait out an outage.
+        Errors a replay would not fix (400/403/404) are raised instead, so
+        the lead is reported as not saved.
+        """
+        if self._outbox is None:
+            self._append_rows(rows)
+            return
+        
+        if len(self._outbox) == 0:
+            try:
+                self._append_rows(rows)
+                return
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+        
+        self._outbox.add(rows)
+    
+    def _append_rows(self, rows: List[List[str]]) -> None:
+        """
+        Append rows to the partitions they belong to, one INSERT_ROWS call each.
+        
+        Rows go by their registration date, so outbox replays land in the
+        period they were registered in. When a batch spans partitions and
+        only some appends fail with a retryable error, those rows are queued
+        in the outbox instead of failing (and later repeating) the ones
+        already written. A partition that rejects its rows outright
+        (400/403/404) fails the batch, as it would on its own; the other
+        partitions' rows stay written or queued.
+        """
+        groups: Dict[str, List[List[str]]] = {}
+        for row in rows:
+            groups.setdefault(self._title_for_row(row), []).append(row)
+        
+        failed: List[List[str]] = []
+        rejected: Optional[Exception] = None
+        for title, group in groups.items():
+            try:
+                self._append_to_partition(self._ensure_partition(title), group)
+            except Exception as e:
+                if len(groups) == 1 or self._outbox is None:
+                    raise
+                if not is_retryable(e):
+                    rejected = rejected or e
+                    continue
+                failed.extend(group)
+        
+        if failed:
+            self._outbox.add(failed)
+            if rejected is not None:
+                # Reported as not saved with the rest of the batch, but they
+                # will land; keep them duplicates until then
+                with self._index_lock:
+                    for row in failed:
+                        self._remember_contact(row, (row[4], row[5]))
+        if rejected is not None:
+            raise rejected
+    
+    def _append_to_partition(self, partition: SheetPartition, rows: List[List[str]]) -> None:
+        """Append rows after the last used row in a single INSERT_ROWS call."""
+        result = self._execute(
+            self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=self._a1(partition.title, "A:H"),
+                valueInputOption='RAW',
+                insertDataOption='INSERT_ROWS',
+                body={'values': rows}
+            )
+        )
+        
+        metrics.count("sheets_leads_written_total", len(rows))
+        
+        updates = result.get("updates", {})
+        written = re.search(r"A(\d+):H\d+$", updates.get("updatedRange", ""))
+        
+        mirror = partition.mirror
+        with self._index_lock:
+            if not mirror.loaded:
+                return
+            if written is None or int(written.group(1)) == mirror.row_count + 1:
+                mirror.extend(rows)
+            else:
+                # Someone else appended in between; fetch the gap on the next read
+                partition.checked_at = float("-inf")
+    
+    def _ensure_partition(self, title: str) -> SheetPartition:
+        partition = self._catalog.get(title)
+        if partition is None:
+            with self._catalog_lock:
+                partition = self._catalog.get(title) or self._create_partition(title)
+        return partition
+    
+    def _create_partition(self, title: str) -> SheetPartition:
+        """
+        Add the worksheet for a new period.
+        
+        The sheet, its header row and their format go in one batchUpdate,
+        which Sheets applies atomically, so a partition never exists
+        without headers.
+        """
+        sheet_id = self._catalog.sheet_id_for(title)
+        header_row = {"values": [{"userEnteredValue": {"stringValue": header}} for header in SHEETS_CONFIG["headers"]]}
+        requests = [
+            {"addSheet": {"properties": {"sheetId": sheet_id, "title": title}}},
+            {
+                "updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                    "rows": [header_row],
+                    "fields": "userEnteredValue"
+                }
+            },
+            self._header_format_request(sheet_id)
+        ]
+        
+        try:
+            self._execute(
+                self.service.spreadsheets().batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
-                    range=write_range,
-                    valueInputOption='RAW',
-                    body=body
+                    body={"requests": requests}
                 )
-                .execute()
             )
-            
-            return True
-            
         except HttpError as e:
-            if e.resp.status == 403:
-                pass
-            elif e.resp.status == 400:
-                pass
-            return False
-        except Exception:
-            return False
+            if e.resp.status != 400:
+                raise
+            # Most likely another process created it first
+            self._load_catalog()
+            partition = self._catalog.get(title)
+            if partition is None:
+                raise
+            return partition
+        
+        metrics.count("sheets_partitions_created_total")
+        partition = self._catalog.add(title, sheet_id)
+        with self._index_lock:
+            partition.mirror.load([list(SHEETS_CONFIG["headers"])])
+            partition.loaded_at = partition.checked_at = time.monotonic()
+        return partition
+    
+    def _title_for_row(self, row: List[str]) -> str:
+        try:
+            registered_at = datetime.strptime(row[7], self.REGISTERED_AT_FORMAT)
+        except (IndexError, ValueError):
+            registered_at = datetime.now()
+        return self._catalog.title_for(registered_at)
+    
+    @staticmethod
+    def _a1(title: str, cells: str) -> str:
+        """A1 range on a worksheet, quoting the title as Sheets requires."""
+        return "'" + title.replace("'", "''") + "'!" + cells
+    
+    def _execute(self, request) -> Dict[str, Any]:
+        """Run a request under the quota limiter, retrying 429/5xx with backoff."""
+        return execute_with_retry(
+            lambda: self._execute_once(request),
+            self._limiter,
+            max_retries=SHEETS_CONFIG["max_retries"],
+            base_delay=SHEETS_CONFIG["retry_base_delay_seconds"],
+            max_delay=SHEETS_CONFIG["retry_max_delay_seconds"]
+        )
+    
+    def _execute_once(self, request) -> Dict[str, Any]:
+        method = getattr(request, "methodId", "unknown")
+        metrics.count("sheets_api_calls_total", method=method)
+        with metrics.timer("sheets_api_duration_seconds", method=method):
+            # httplib2 is not thread-safe; each thread sends over its own pooled transport
+            return request.execute(http=get_google_http(self.credentials))
+    
+    @staticmethod
+    def _resolved(value: bool) -> "Future[bool]":
+        future: "Future[bool]" = Future()
+        future.set_result(value)
+        return future
     
     def _is_duplicate(self, state: LeadState) -> bool:
+        """Check against every partition's mirror; the caller holds the index lock."""
+        key = (state["contact"], state["contact_type"])
+        if key in self._pending_contacts:
+            return True
+        return any(key in partition.mirror.contacts for partition in self._catalog.partitions())
+    
+    def _try_sync_mirror(self) -> None:
+        # If Sheets cannot be read, duplicates are checked against what is mirrored
         try:
-            sheet = self.service.spreadsheets()
-            read_range = f"{self.sheet_name}!A:H"
-            
-            result = sheet.values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=read_range
-            ).execute()
-            
-            values = result.get("values", [])
-            if not values or len(values) <= 1:
-                return False
-            
-            headers = values[0] if values else []
-            data_rows = values[1:] if len(values) > 1 else []
-            
-            contact_col = None
-            contact_type_col = None
-            
-            for i, header in enumerate(headers):
-                if "Contacto" in header and "Tipo" not in header:
-                    contact_col = i
-                elif "Tipo de Contacto" in header:
-                    contact_type_col = i
-            
-            if contact_col is None or contact_type_col is None:
-                return False
-            
-            for row in data_rows:
-                if (len(row) > max(contact_col, contact_type_col) and
-                    row[contact_col] == state["contact"] and 
-                    row[contact_type_col] == state["contact_type"]):
-                    return True
-            
-            return False
-            
+            self._sync_mirror()
         except HttpError:
-            return False
+            pass
         except Exception:
+            pass
+    
+    def _sync_mirror(self) -> None:
+        """
+        Bring the lead table mirror up to date.
+        
+        The first call reads A:H once. After that, at most once per
+        ``index_revision_check_seconds``, only the rows past the last
+        mirrored one are fetched. A full reload every
+        ``mirror_full_resync_seconds`` picks up rows edited or deleted
+        by hand, which a delta read cannot see.
+        
+        Every partition has its own mirror; only the one taking writes is
+        checked for new rows that often, the others on full reloads.
+        
+        Callers arriving while a read is in flight wait for that read
+        instead of issuing their own. Must not be called with the index
+        lock held.
+        """
+        self._sync_catalog()
+        for partition in self._catalog.partitions():
+            self._reads.do(self._mirror_read_key(partition), lambda p=partition: self._read_mirror(p))
+    
+    async def _async_sync_mirror(self) -> None:
+        """``_sync_mirror`` without blocking the loop; partitions are read concurrently."""
+        await self._async_sync_catalog()
+        await asyncio.gather(*(
+            self._async_reads.do(self._mirror_read_key(partition), lambda p=partition: self._async_read_mirror(p))
+            for partition in self._catalog.partitions()
+        ))
+    
+    def _mirror_read_key(self, partition: SheetPartition) -> Tuple[str, str, str]:
+        return ("mirror", self.spreadsheet_id, partition.title)
+    
+    def _read_mirror(self, partition: SheetPartition) -> None:
+        plan = self._plan_mirror_read(partition)
+        if plan is not None:
+            result = self._execute(
+                self.service.spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=self._a1(partition.title, f"A{plan[0]}:H")
+                )
+            )
+            self._apply_mirror_read(partition, plan, result.get("values", []))
+    
+    async def _async_read_mirror(self, partition: SheetPartition) -> None:
+        plan = self._plan_mirror_read(partition)
+        if plan is not None:
+            result = await self._get_async_client().get_values(
+                self.spreadsheet_id, self._a1(partition.title, f"A{plan[0]}:H")
+            )
+            self._apply_mirror_read(partition, plan, result.get("values", []))
+    
+    def _plan_mirror_read(self, partition: SheetPartition) -> Optional[Tuple[int, bool, float]]:
+        """First row to read, whether it is a full reload and when it started; None if fresh."""
+        if partition.title == self._catalog.title_for(datetime.now()):
+            check_interval = SHEETS_CONFIG["index_revision_check_seconds"]
+        else:
+            # Past periods only change by hand, which a delta read cannot see anyway
+            check_interval = SHEETS_CONFIG["mirror_full_resync_seconds"]
+        
+        with self._index_lock:
+            started = time.monotonic()
+            full = not partition.mirror.loaded or started - partition.loaded_at >= SHEETS_CONFIG["mirror_full_resync_seconds"]
+            if not full and started - partition.checked_at < check_interval:
+                return None
+            if not full:
+                # Concurrent sync and async readers skip the same delta
+                partition.checked_at = started
+            return (1 if full else partition.mirror.row_count + 1), full, started
+    
+    def _apply_mirror_read(self, partition: SheetPartition, plan: Tuple[int, bool, float], values: List[List[str]]) -> None:
+        # The read ran outside the index lock, so it is applied only if no
+        # other reader or writer moved the mirror meanwhile
+        first_row, full, started = plan
+        mirror = partition.mirror
+        with self._index_lock:
+            if full:
+                if partition.loaded_at < started or not mirror.loaded:
+                    self._apply_full_read(partition, values)
+            elif mirror.loaded and mirror.row_count + 1 == first_row:
+                mirror.extend(values)
+    
+    def _get_async_client(self) -> AsyncSheetsClient:
+        if self._async_client is None or self._async_client.credentials is not self.credentials:
+            self._async_client = AsyncSheetsClient(self.credentials, self._limiter)
+        return self._async_client
+    
+    def _apply_full_read(self, partition: SheetPartition, values: List[List[str]]) -> None:
+        partition.mirror.load(values)
+        
+        # Leads waiting in the outbox are not in the sheet yet
+        columns = partition.mirror.contact_columns
+        if self._outbox is not None and columns is not None:
+            partition.mirror.contacts |= self._outbox.contacts(*columns)
+        
+        partition.loaded_at = partition.checked_at = time.monotonic()
+    
+    def _catalog_is_stale(self) -> bool:
+        """Whether another process may have added a partition we have not seen."""
+        if self._catalog.scheme is None:
             return False
+        elapsed = time.monotonic() - self._catalog.checked_at
+        if self._catalog.get(self._catalog.title_for(datetime.now())) is None:
+            return elapsed >= SHEETS_CONFIG["index_revision_check_seconds"]
+        return elapsed >= SHEETS_CONFIG["mirror_full_resync_seconds"]
+    
+    def _sync_catalog(self) -> None:
+        if self._catalog_is_stale():
+            self._reads.do(("catalog", self.spreadsheet_id), self._load_catalog)
+    
+    async def _async_sync_catalog(self) -> None:
+        if self._catalog_is_stale():
+            await self._async_reads.do(("catalog", self.spreadsheet_id), self._async_load_catalog)
+    
+    def _load_catalog(self) -> None:
+        self._catalog.checked_at = time.monotonic()
+        info = self._execute(
+            self.service.spreadsheets().get(spreadsheetId=self.spreadsheet_id, fields=self.CATALOG_FIELDS)
+        )
+        self._catalog.load(info.get("sheets", []))
     
-    def _prepare_row_data(self, state: LeadState) -> List[str]:
+    async def _async_load_catalog(self) -> None:
+        self._catalog.checked_at = time.monotonic()
+        info = await self._get_async_client().get_spreadsheet(self.spreadsheet_id, fields=self.CATALOG_FIELDS)
+        self._catalog.load(info.get("sheets", []))
+    
+    def _invalidate_mirror(self) -> None:
+        with self._index_lock:
+            for partition in self._catalog.partitions():
+                partition.mirror.reset()
+    
+    def _prepare_row_data(self, state: LeadState, registered_at: Optional[datetime] = None) -> List[str]:
         return [
             "Sí" if state["is_corporate"] else "No",
             state["event_type"] or "No especificado",
@@ -339,7 +769,7 @@ class GoogleSheetsService:
             state["contact"] or "No especificado",
             state["contact_type"] or "No especificado",
             "Sí" if state["qualified"] else "No",
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            (registered_at or datetime.now()).strftime(self.REGISTERED_AT_FORMAT)
         ]
     
     def get_all_leads(self) -> List[Dict[str, Any]]:
@@ -347,29 +777,13 @@ class GoogleSheetsService:
             return []
         
         try:
-            sheet = self.service.spreadsheets()
-            read_range = f"{self.sheet_name}!A:H"
-            
-            result = sheet.values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=read_range
-            ).execute()
-            
-            values = result.get("values", [])
-            if not values:
-                return []
-            
-            headers = values[0]
-            data_rows = values[1:] if len(values) > 1 else []
-            
-            records = []
-            for row in data_rows:
-                record = {}
-                for i, header in enumerate(headers):
-                    record[header] = row[i] if i < len(row) else ""
-                records.append(record)
-            
-            return records
+            self._sync_mirror()
+            with self._index_lock:
+                return [
+                    record
+                    for partition in self._catalog.partitions()
+                    for record in partition.mirror.records()
+                ]
             
         except HttpError:
             return []
@@ -381,16 +795,9 @@ class GoogleSheetsService:
             return 0
         
         try:
-            sheet = self.service.spreadsheets()
-            read_range = f"{self.sheet_name}!A:H"
-            
-            result = sheet.values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=read_range
-            ).execute()
-            
-            values = result.get("values", [])
-            return max(0, len(values) - 1) if values else 0
+            self._sync_mirror()
+            with self._index_lock:
+                return sum(len(partition.mirror.rows) for partition in self._catalog.partitions())
             
         except HttpError:
             return 0
@@ -398,12 +805,16 @@ class GoogleSheetsService:
             return 0
 
 
-# Global instance
-sheets_service = GoogleSheetsService()
+# Global instance, built on first use
+sheets_service = LazyService(GoogleSheetsService)
+
+
+def save_lead_to_sheets(state: LeadState) -> "Future[bool]":
+    return sheets_service.submit_lead(state)
 
 
-def save_lead_to_sheets(state: LeadState) -> bool:
-    return sheets_service.save_lead(state)
+def flush_sheets_writes(timeout: Optional[float] = None) -> bool:
+    return sheets_service.flush(timeout)
 
 
 def is_sheets_available() -> bool:
@@ -419,4 +830,8 @@ def get_sheets_status() -> Dict[str, Any]:
 
 
 def set_spreadsheet_id(spreadsheet_id: str) -> bool:
-    return sheets_service.set_spreadsheet_id(spreadsheet_id)
\ No newline at end of file
+    return sheets_service.set_spreadsheet_id(spreadsheet_id)
+
+
+def prewarm_sheets_service() -> None:
+    sheets_service.prewarm()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+HTTP transports shared by the Google Sheets and OpenAI clients.
+
+Both clients default to a fresh connection stack per client object; here
+they get long-lived pools with keep-alive, so a lead's API calls reuse
+warm TLS connections instead of opening new ones.
+"""
+
+import asyncio
+import functools
+import json
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict
+
+from config import HTTP_CONFIG
+from services.registry import LazyService
+
+
+SHEETS_DISCOVERY_URL = "https://sheets.googleapis.com/$discovery/rest?version=v4"
+
+_google_local = threading.local()
+_google_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_openai_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_google_http(credentials):
+    """
+    Authorized httplib2 transport for the calling thread.
+    
+    httplib2.Http is not thread-safe, so each thread (request handlers,
+    the batched writer, the outbox drainer) keeps its own, together with
+    its keep-alive connection to the API host.
+    """
+    http = getattr(_google_local, "http", None)
+    if http is None or http.credentials is not credentials:
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        
+        http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_CONFIG["timeout_seconds"]))
+        _google_local.http = http
+    return http
+
+
+def get_google_async_http():
+    """
+    Pooled httpx.AsyncClient for Google APIs, one per event loop: an async
+    connection pool cannot be shared between loops.
+    """
+    return _loop_client(_google_async_clients)
+
+
+def _loop_client(clients: "weakref.WeakKeyDictionary"):
+    loop = asyncio.get_running_loop()
+    client = clients.get(loop)
+    if client is None:
+        client = clients[loop] = _build_async_http_client()
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def load_sheets_discovery() -> Dict[str, Any]:
+    """
+    Sheets v4 discovery document, parsed once per process.
+    
+    Uses the copy bundled with google-api-python-client when there is one;
+    otherwise the document is downloaded once and kept on disk.
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+    
+    document = get_static_doc("sheets", "v4")
+    if document is None:
+        cache_dir = HTTP_CONFIG["discovery_cache_dir"] or Path(__file__).parent.parent / "data"
+        path = Path(cache_dir) / "sheets.v4.json"
+        
+        if path.exists():
+            document = path.read_text(encoding="utf-8")
+        else:
+            import httplib2
+            
+            _, content = httplib2.Http(timeout=HTTP_CONFIG["timeout_seconds"]).request(SHEETS_DISCOVERY_URL)
+            document = content.decode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(document, encoding="utf-8")
+    
+    return json.loads(document)
+
+
+def _build_http_client():
+    import httpx
+    
+    return httpx.Client(limits=_httpx_limits(), timeout=HTTP_CONFIG["timeout_seconds"])
+
+
+def _build_async_http_client():
+    import httpx
+    
+    return httpx.AsyncClient(limits=_httpx_limits(), timeout=HTTP_CONFIG["timeout_seconds"])
+
+
+def _build_openai_async_http_client():
+    """
+    httpx.AsyncClient for ChatOpenAI that sends every request through the
+    pool of the running loop. The model is built once per process but is
+    awaited from several loops (one asyncio.run per CLI conversation, the
+    server's loop), and a pool bound to one loop fails on the others.
+    """
+    import httpx
+    
+    class LoopBoundAsyncClient(httpx.AsyncClient):
+        async def send(self, request, **kwargs):
+            return await _loop_client(_openai_async_clients).send(request, **kwargs)
+    
+    return LoopBoundAsyncClient(timeout=HTTP_CONFIG["timeout_seconds"])
+
+
+def _httpx_limits():
+    import httpx
+    
+    return httpx.Limits(
+        max_connections=HTTP_CONFIG["max_connections"],
+        max_keepalive_connections=HTTP_CONFIG["max_keepalive_connections"],
+        keepalive_expiry=HTTP_CONFIG["keepalive_expiry_seconds"]
+    )
+
+
+# Pooled clients handed to every ChatOpenAI instance, built on first use
+openai_http_client = LazyService(_build_http_client)
+openai_async_http_client = LazyService(_build_openai_async_http_client)
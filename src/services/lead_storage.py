@@ -0,0 +1,319 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from config import STORAGE_CONFIG
+from models.state import LeadState
+from services.google_sheets import DuplicateLeadError, sheets_service
+from services.registry import LazyService
+
+
+class LeadStorage(ABC):
+    """Where qualified and unqualified leads are persisted."""
+    
+    @abstractmethod
+    def is_available(self) -> bool:
+        ...
+    
+    @abstractmethod
+    def save_lead(self, state: LeadState) -> bool:
+        """Store a lead; False if it is a duplicate or could not be accepted."""
+    
+    async def asave_lead(self, state: LeadState) -> bool:
+        """``save_lead`` from async code; backends without native async I/O use a thread."""
+        return await asyncio.to_thread(self.save_lead, state)
+    
+    def save_leads(self, states: List[LeadState]) -> List[bool]:
+        return [self.save_lead(state) for state in states]
+    
+    @abstractmethod
+    def get_lead_count(self) -> int:
+        ...
+    
+    @abstractmethod
+    def get_all_leads(self) -> List[Dict[str, Any]]:
+        ...
+    
+    def flush(self) -> None:
+        """Wait until every accepted lead has been written."""
+    
+    def close(self) -> None:
+        self.flush()
+
+
+class SheetsLeadStorage(LeadStorage):
+    """Google Sheets backend, writing through the batched writer."""
+    
+    def is_available(self) -> bool:
+        return sheets_service.is_available()
+    
+    def save_lead(self, state: LeadState) -> bool:
+        return self._accepted(sheets_service.submit_lead(state))
+    
+    async def asave_lead(self, state: LeadState) -> bool:
+        return self._accepted(await sheets_service.asubmit_lead(state))
+    
+    def get_lead_count(self) -> int:
+        return sheets_service.get_lead_count()
+    
+    def get_all_leads(self) -> List[Dict[str, Any]]:
+        return sheets_service.get_all_leads()
+    
+    def flush(self) -> None:
+        sheets_service.flush()
+    
+    @staticmethod
+    def _accepted(future: "Future[bool]") -> bool:
+        # Duplicates and leads the writer did not take are settled before
+        # queueing; anything still pending has been accepted
+        if not future.done():
+            return True
+        return future.exception() is None and future.result()
+
+
+class SQLiteLeadStorage(LeadStorage):
+    """
+    Local SQLite backend.
+    
+    The table has a unique index on (contact, contact_type), so duplicate
+    detection is the insert itself. WAL mode lets readers and a replicator
+    run alongside the writer.
+    """
+    
+    COLUMNS = [
+        "is_corporate", "event_type", "budget", "name",
+        "contact", "contact_type", "qualified", "created_at"
+    ]
+    CREATED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+    
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                is_corporate INTEGER,
+                event_type TEXT,
+                budget REAL,
+                name TEXT,
+                contact TEXT NOT NULL,
+                contact_type TEXT NOT NULL,
+                qualified INTEGER,
+                created_at TEXT NOT NULL,
+                synced INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS leads_contact
+                ON leads (contact, contact_type);
+            CREATE INDEX IF NOT EXISTS leads_unsynced
+                ON leads (synced) WHERE synced = 0;
+            """
+        )
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def save_lead(self, state: LeadState) -> bool:
+        return self.save_leads([state])[0]
+    
+    def save_leads(self, states: List[LeadState]) -> List[bool]:
+        """Insert many leads in a single transaction."""
+        created_at = datetime.now().strftime(self.CREATED_AT_FORMAT)
+        results = []
+        
+        with self._lock, self._connection:
+            for state in states:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO leads "
+                    "(is_corporate, event_type, budget, name, contact, contact_type, qualified, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        state["is_corporate"], state["event_type"], state["budget"], state["name"],
+                        state["contact"], state["contact_type"], state["qualified"], created_at
+                    )
+                )
+                results.append(cursor.rowcount == 1)
+        
+        return results
+    
+    def get_lead_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+    
+    def get_all_leads(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM leads ORDER BY id"
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+    
+    def get_unsynced(self, limit: int) -> List[tuple[int, LeadState]]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, {', '.join(self.COLUMNS)} FROM leads WHERE synced = 0 ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(row[0], self._to_record(row[1:])) for row in rows]
+    
+    def mark_synced(self, lead_ids: List[int]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE leads SET synced = 1 WHERE id = ?",
+                [(lead_id,) for lead_id in lead_ids]
+            )
+    
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+    
+    def _to_record(self, row: tuple) -> Dict[str, Any]:
+        record = dict(zip(self.COLUMNS, row))
+        for key in ("is_corporate", "qualified"):
+            if record[key] is not None:
+                record[key] = bool(record[key])
+        return record
+
+
+class ReplicatedLeadStorage(LeadStorage):
+    """
+    SQLite as the system of record with Google Sheets as an async replica.
+    
+    Leads are captured locally; a background thread pushes unsynced rows
+    to Sheets and keeps retrying them while Sheets is slow or down.
+    """
+    
+    def __init__(self, primary: SQLiteLeadStorage, interval: float, batch_size: int):
+        self.primary = primary
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # The background pass and flush() must not push the same rows twice
+        self._replicate_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="sheets-replicator", daemon=True)
+        self._thread.start()
+    
+    def is_available(self) -> bool:
+        return self.primary.is_available()
+    
+    def save_lead(self, state: LeadState) -> bool:
+        return self.primary.save_lead(state)
+    
+    def save_leads(self, states: List[LeadState]) -> List[bool]:
+        return self.primary.save_leads(states)
+    
+    def get_lead_count(self) -> int:
+        return self.primary.get_lead_count()
+    
+    def get_all_leads(self) -> List[Dict[str, Any]]:
+        return self.primary.get_all_leads()
+    
+    def flush(self) -> None:
+        """Run one replication pass now."""
+        self.replicate()
+    
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self.replicate()
+        self.primary.close()
+    
+    def replicate(self) -> int:
+        """Push unsynced leads to Sheets; returns how many were confirmed."""
+        if not sheets_service.is_available():
+            return 0
+        
+        with self._replicate_lock:
+            confirmed = 0
+            while pending := self.primary.get_unsynced(self.batch_size):
+                futures: List[tuple[int, "Future[bool]"]] = []
+                synced = []
+                
+                for lead_id, state in pending:
+                    # Keep the capture time, so the row lands in the partition of its month
+                    registered_at = datetime.strptime(state["created_at"], self.primary.CREATED_AT_FORMAT)
+                    future = sheets_service.submit_lead(state, registered_at)
+                    if future.done() and isinstance(future.exception(), DuplicateLeadError):
+                        # The contact is already in the sheet
+                        synced.append(lead_id)
+                    else:
+                        # Leads not accepted resolve to False and stay unsynced for the next pass
+                        futures.append((lead_id, future))
+                
+                sheets_service.flush()
+                synced.extend(lead_id for lead_id, future in futures if future.result())
+                self.primary.mark_synced(synced)
+                confirmed += len(synced)
+                
+                if len(synced) < len(pending):
+                    break
+            
+            return confirmed
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.replicate()
+            except Exception:
+                pass
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+def create_lead_storage() -> LeadStorage:
+    backend = os.getenv("LEAD_STORAGE_BACKEND") or STORAGE_CONFIG["backend"]
+    
+    if backend == "sheets":
+        return SheetsLeadStorage()
+    
+    path = (
+        os.getenv("LEAD_STORAGE_PATH")
+        or STORAGE_CONFIG["sqlite_path"]
+        or str(Path(__file__).parent.parent / "data" / "leads.db")
+    )
+    sqlite_storage = SQLiteLeadStorage(path)
+    
+    if backend == "sqlite":
+        return sqlite_storage
+    if backend == "sqlite+sheets":
+        return ReplicatedLeadStorage(
+            sqlite_storage,
+            interval=STORAGE_CONFIG["replication_interval_seconds"],
+            batch_size=STORAGE_CONFIG["replication_batch_size"]
+        )
+    
+    raise ValueError(f"Unknown lead storage backend: {backend}")
+
+
+# Global instance, built on first use
+lead_storage = LazyService(create_lead_storage)
+
+
+def save_lead_to_storage(state: LeadState) -> bool:
+    return lead_storage.save_lead(state)
+
+
+async def asave_lead_to_storage(state: LeadState) -> bool:
+    return await lead_storage.asave_lead(state)
+
+
+def save_leads_to_storage(states: List[LeadState]) -> List[bool]:
+    return lead_storage.save_leads(states)
+
+
+def is_storage_available() -> bool:
+    return lead_storage.is_available()
+
+
+def flush_storage() -> None:
+    lead_storage.flush()
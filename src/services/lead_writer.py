@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+
+_FLUSH = object()
+_STOP = object()
+
+
+class BatchedLeadWriter:
+    """
+    Write-behind sink that groups queued rows into batched append calls.
+    
+    Rows are flushed from a background thread once ``batch_size`` rows are
+    waiting or ``flush_interval`` seconds have passed since the first one
+    was queued, whichever comes first.
+    """
+    
+    def __init__(
+        self,
+        append_rows: Callable[[List[List[str]]], None],
+        batch_size: int = 100,
+        flush_interval: float = 1.0
+    ):
+        self._append_rows = append_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="sheets-lead-writer", daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, row: List[str]) -> "Future[bool]":
+        """Queue a row and return a future resolved once its batch is written."""
+        future: "Future[bool]" = Future()
+        
+        with self._lock:
+            if self._closed:
+                future.set_result(False)
+                return future
+            self._queue.put((row, future))
+        
+        return future
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write every queued row now and wait until that is done."""
+        done = threading.Event()
+        
+        with self._lock:
+            if self._closed:
+                return True
+            self._queue.put((_FLUSH, done))
+        
+        return done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending rows and stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((_STOP, None))
+        
+        self._thread.join(timeout)
+    
+    def _run(self) -> None:
+        batch: List[Tuple[List[str], Future]] = []
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            
+            try:
+                item, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(batch)
+                batch, deadline = [], None
+                continue
+            
+            if item is _FLUSH or item is _STOP:
+                self._write(batch)
+                batch, deadline = [], None
+                if item is _STOP:
+                    return
+                payload.set()
+                continue
+            
+            batch.append((item, payload))
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch, deadline = [], None
+    
+    def _write(self, batch: List[Tuple[List[str], Future]]) -> None:
+        if not batch:
+            return
+        
+        try:
+            self._append_rows([row for row, _ in batch])
+            success = True
+        except Exception:
+            success = False
+        
+        for _, future in batch:
+            future.set_result(success)
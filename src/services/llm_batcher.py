@@ -0,0 +1,99 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+from services.metrics import metrics
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Groups concurrent calls into batches.
+    
+    Items submitted on one event loop are collected for at most
+    ``max_wait_seconds`` (or until ``max_batch_size`` are waiting) and
+    handed to ``call_batch`` together; each caller gets its own result
+    back. A lone item goes to ``call_one``, and so does every item of a
+    batch whose call fails, so a bad batch answer costs a retry rather
+    than the results.
+    """
+    
+    def __init__(
+        self,
+        call_batch: Callable[[List[T]], Awaitable[List[R]]],
+        call_one: Callable[[T], Awaitable[R]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        name: str = "batch"
+    ):
+        self.call_batch = call_batch
+        self.call_one = call_one
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[T, "asyncio.Future[R]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+    
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures of another (finished) loop can never be resolved here
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+        
+        future: "asyncio.Future[R]" = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            # Keep a reference until the batch is done
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        items = [item for item, _ in batch]
+        metrics.count("micro_batches_total", batcher=self.name)
+        metrics.count("micro_batch_items_total", len(items), batcher=self.name)
+        
+        if len(items) > 1:
+            try:
+                results = await self.call_batch(items)
+                if len(results) != len(items):
+                    raise ValueError(f"expected {len(items)} results, got {len(results)}")
+            except Exception:
+                metrics.count("micro_batch_fallbacks_total", batcher=self.name)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+        
+        await asyncio.gather(*(self._run_one(item, future) for item, future in batch))
+    
+    async def _run_one(self, item: T, future: "asyncio.Future[R]") -> None:
+        try:
+            result = await self.call_one(item)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
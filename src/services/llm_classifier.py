@@ -1,30 +1,35 @@
+import json
 import os
-from pathlib import Path
-from typing import Optional
+from contextlib import aclosing, closing
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from config import ERROR_MESSAGES
+from langchain_core.messages import BaseMessage
+from config import ERROR_MESSAGES, LLM_CONFIG, CLASSIFICATION_CACHE_CONFIG
+from services.classification_cache import ClassificationCache, make_cache_key
+from services.llm_batcher import MicroBatcher
+from services.llm_router import create_router
+from services.metrics import token_usage_callbacks
+from services.prompt_registry import prompt_registry
+from services.registry import LazyService
+from services.single_flight import AsyncSingleFlight, SingleFlight
 
 load_dotenv()
 
+CORPORATE_LABEL = "Corporativo"
+# Enough of the answer to tell CORPORATIVO apart from any event type
+CORPORATE_PREFIX = "CORP"
+
+CLASSIFICATION_PROMPT = "event_classification.md"
+# Same task for a JSON array of descriptions, answered with a JSON array
+CLASSIFICATION_BATCH_PROMPT = "event_classification_batch.md"
+# Only the part of the file after this header is sent to the model
+CLASSIFICATION_SECTION = "Instrucciones de Respuesta"
+
 
 def load_prompt_template() -> str:
     """Load the prompt template from markdown file."""
-    prompt_file = Path(__file__).parent.parent / "prompts" / "event_classification.md"
-    
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract the template part (everything after the last ##)
-    sections = content.split('## Instrucciones de Respuesta')
-    if len(sections) >= 2:
-        template_section = sections[1].strip()
-        return template_section
-    else:
-        # Fallback to the entire content if structure is different
-        return content
+    return prompt_registry.get(CLASSIFICATION_PROMPT, CLASSIFICATION_SECTION).content
 
 
 class EventClassifier:
@@ -33,26 +38,63 @@ class EventClassifier:
     def __init__(self):
         self.llm = None
         self.prompt_template = None
-        self.output_parser = StrOutputParser()
+        self.template_hash = None
+        self.batch_template_hash = None
+        self.chain = None
+        self.model_name = None
+        self.cache = ClassificationCache(
+            max_entries=CLASSIFICATION_CACHE_CONFIG["max_entries"],
+            ttl_seconds=CLASSIFICATION_CACHE_CONFIG["ttl_seconds"],
+            sqlite_path=os.getenv("CLASSIFICATION_CACHE_PATH") or CLASSIFICATION_CACHE_CONFIG["sqlite_path"]
+        )
+        # Identical descriptions in flight at once share one classification
+        self._flights = SingleFlight("classification")
+        self._async_flights = AsyncSingleFlight("classification")
+        self.batcher: Optional[MicroBatcher] = None
+        if LLM_CONFIG["micro_batch_window_seconds"] > 0:
+            self.batcher = MicroBatcher(
+                self._aclassify_batch,
+                self._aclassify_one,
+                max_batch_size=LLM_CONFIG["micro_batch_max_size"],
+                max_wait_seconds=LLM_CONFIG["micro_batch_window_seconds"],
+                name="classification"
+            )
         self._initialize_llm()
     
     def _initialize_llm(self) -> None:
         try:
-            self.llm = ChatOpenAI(
-                model="gpt-3.5-turbo",
-                temperature=0.1, 
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
+            self.llm = create_router()
+            # Cached answers are only valid for the same set of backends
+            self.model_name = ",".join(backend.name for backend in self.llm.backends)
             
-            # Load prompt template from markdown file
-            template_content = load_prompt_template()
-            self.prompt_template = ChatPromptTemplate.from_template(template_content)
+            self._refresh_chain()
             
         except Exception as e:
             self.llm = None
     
+    def _refresh_chain(self) -> None:
+        """Recompose the chain when the prompt file changed on disk."""
+        try:
+            prompt = prompt_registry.get(CLASSIFICATION_PROMPT, CLASSIFICATION_SECTION)
+        except OSError:
+            # Keep serving the last good template if the file is mid-edit
+            if self.chain is None:
+                raise
+            return
+        
+        if prompt.hash != self.template_hash:
+            self.prompt_template = prompt.template
+            self.chain = prompt.template | self.llm
+            self.template_hash = prompt.hash
+        
+        if self.batcher is not None:
+            try:
+                self.batch_template_hash = prompt_registry.get(CLASSIFICATION_BATCH_PROMPT, CLASSIFICATION_SECTION).hash
+            except OSError:
+                pass
+    
     def is_available(self) -> bool:
-        return self.llm is not None and os.getenv("OPENAI_API_KEY") is not None
+        return self.llm is not None and self.llm.is_available()
 
     
     def classify_event(self, event_description: str) -> tuple[Optional[bool], Optional[str]]:
@@ -70,30 +112,294 @@ class EventClassifier:
         if not self.is_available():
             return None, None
         
+        self._refresh_chain()
+        cache_key = make_cache_key(event_description, self.model_name, self.template_hash)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            chain = self.prompt_template | self.llm | self.output_parser
-            response = chain.invoke({"event_description": event_description})
-            response_clean = response.strip().upper()
-            
-            if response_clean == "CORPORATIVO":
-                return True, "Corporativo"
-            else:
-                # If not CORPORATIVO, the response should be the specific event type
-                event_type = response.strip().title()
-                return False, event_type
+            return self._flights.do(cache_key, lambda: self._classify_uncached(cache_key, event_description))
                     
         except Exception as e:
             print(ERROR_MESSAGES["llm_classification_error"].format(error=e))
             return None, None
+    
+    async def aclassify_event(self, event_description: str) -> tuple[Optional[bool], Optional[str]]:
+        """
+        Async counterpart of ``classify_event``.
+        
+        Concurrent calls for the same description share one classification.
+        Other cache misses from concurrent sessions go through the
+        micro-batcher, which sends them as one request; a description with
+        no company in the window is streamed on its own.
+        """
+        if not self.is_available():
+            return None, None
+        
+        self._refresh_chain()
+        cache_key = make_cache_key(event_description, self.model_name, self._async_template_hash())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            return await self._async_flights.do(
+                cache_key, lambda: self._aclassify_uncached(cache_key, event_description)
+            )
+            
+        except Exception as e:
+            print(ERROR_MESSAGES["llm_classification_error"].format(error=e))
+            return None, None
+    
+    def _async_template_hash(self) -> str:
+        """
+        Template part of the cache key for ``aclassify_event``. Its answers
+        may come from the batch prompt, so editing either file must
+        invalidate them.
+        """
+        if self.batcher is None:
+            return self.template_hash
+        return f"{self.template_hash}+{self.batch_template_hash}"
+    
+    def _classify_streaming(self, inputs: Dict[str, str]) -> tuple[tuple[bool, str], bool]:
+        """
+        Stream the completion and stop as soon as it reads as CORPORATIVO.
+        
+        Closing the stream early drops the HTTP response, which ends the
+        generation server-side. Event types are read to the end, which
+        ``max_tokens`` keeps short.
+        
+        Returns:
+            The classification and whether it may be cached
+        """
+        response = ""
+        cacheable = True
+        with closing(self.chain.stream(inputs, config={"callbacks": token_usage_callbacks})) as chunks:
+            for chunk in chunks:
+                cacheable = cacheable and self._is_cacheable(chunk)
+                response += chunk.content
+                if self._is_corporate(response):
+                    return (True, CORPORATE_LABEL), cacheable
+        return self._parse_response(response), cacheable
+    
+    def _classify_uncached(self, cache_key: str, event_description: str) -> tuple[bool, str]:
+        result, cacheable = self._classify_streaming({"event_description": event_description})
+        if cacheable:
+            self.cache.set(cache_key, result)
+        return result
+    
+    async def _aclassify_uncached(self, cache_key: str, event_description: str) -> tuple[bool, str]:
+        if self.batcher is not None:
+            result, cacheable = await self.batcher.submit(event_description)
+        else:
+            result, cacheable = await self._aclassify_one(event_description)
+        if cacheable:
+            self.cache.set(cache_key, result)
+        return result
+    
+    async def _aclassify_one(self, event_description: str) -> tuple[tuple[bool, str], bool]:
+        return await self._aclassify_streaming({"event_description": event_description})
+    
+    async def _aclassify_batch(self, event_descriptions: List[str]) -> List[tuple[tuple[bool, str], bool]]:
+        """Classify several descriptions with one request; raises ValueError on a bad answer."""
+        prompt = prompt_registry.get(CLASSIFICATION_BATCH_PROMPT, CLASSIFICATION_SECTION)
+        max_tokens = LLM_CONFIG["micro_batch_tokens_per_item"] * len(event_descriptions)
+        chain = prompt.template | self.llm.bind(max_tokens=max_tokens)
+        
+        response = await chain.ainvoke(
+            {"event_descriptions": json.dumps(event_descriptions, ensure_ascii=False)},
+            config={"callbacks": token_usage_callbacks}
+        )
+        cacheable = self._is_cacheable(response)
+        return [
+            (result, cacheable)
+            for result in self._parse_batch_response(response.content, len(event_descriptions))
+        ]
+    
+    async def _aclassify_streaming(self, inputs: Dict[str, str]) -> tuple[tuple[bool, str], bool]:
+        response = ""
+        cacheable = True
+        async with aclosing(self.chain.astream(inputs, config={"callbacks": token_usage_callbacks})) as chunks:
+            async for chunk in chunks:
+                cacheable = cacheable and self._is_cacheable(chunk)
+                response += chunk.content
+                if self._is_corporate(response):
+                    return (True, CORPORATE_LABEL), cacheable
+        return self._parse_response(response), cacheable
+    
+    def _is_cacheable(self, message: BaseMessage) -> bool:
+        # A keyword answer from the offline fallback must not be served in
+        # place of the LLM's for the whole cache TTL
+        return not self.llm.answered_by_fallback(message)
+    
+    def classify_events(
+        self,
+        event_descriptions: Iterable[str],
+        max_concurrency: Optional[int] = None
+    ) -> Iterator[tuple[Optional[bool], Optional[str]]]:
+        """
+        Classify many events, yielding results in input order.
+        
+        Descriptions are consumed in chunks; within a chunk, cached and
+        repeated descriptions are resolved without a request and the rest
+        go through ``chain.batch`` with bounded concurrency.
+        
+        Args:
+            event_descriptions: Descriptions to classify, may be a generator
+            max_concurrency: Maximum requests in flight at once
+            
+        Yields:
+            (is_corporate, event_type) tuples, (None, None) on error
+        """
+        max_concurrency = max_concurrency or LLM_CONFIG["batch_max_concurrency"]
+        
+        for chunk in self._chunks(event_descriptions):
+            if not self.is_available():
+                yield from [(None, None)] * len(chunk)
+                continue
+            
+            self._refresh_chain()
+            keys, results, pending = self._resolve_from_cache(chunk)
+            if pending:
+                responses = self.chain.batch(
+                    [{"event_description": description} for description in pending.values()],
+                    config={"max_concurrency": max_concurrency, "callbacks": token_usage_callbacks},
+                    return_exceptions=True
+                )
+                self._store_responses(pending, responses, results)
+            
+            yield from (results[key] for key in keys)
+    
+    async def aclassify_events(
+        self,
+        event_descriptions: Iterable[str],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[tuple[Optional[bool], Optional[str]]]:
+        """Async counterpart of ``classify_events`` built on ``chain.abatch``."""
+        max_concurrency = max_concurrency or LLM_CONFIG["batch_max_concurrency"]
+        
+        for chunk in self._chunks(event_descriptions):
+            if not self.is_available():
+                for _ in chunk:
+                    yield None, None
+                continue
+            
+            self._refresh_chain()
+            keys, results, pending = self._resolve_from_cache(chunk)
+            if pending:
+                responses = await self.chain.abatch(
+                    [{"event_description": description} for description in pending.values()],
+                    config={"max_concurrency": max_concurrency, "callbacks": token_usage_callbacks},
+                    return_exceptions=True
+                )
+                self._store_responses(pending, responses, results)
+            
+            for key in keys:
+                yield results[key]
+    
+    @staticmethod
+    def _chunks(event_descriptions: Iterable[str]) -> Iterator[List[str]]:
+        iterator = iter(event_descriptions)
+        while chunk := list(islice(iterator, LLM_CONFIG["batch_chunk_size"])):
+            yield chunk
+    
+    def _resolve_from_cache(self, chunk: List[str]) -> tuple[List[str], Dict[str, Any], Dict[str, str]]:
+        """Return each description's cache key, the cached results and the unique misses."""
+        keys = []
+        results: Dict[str, Any] = {}
+        pending: Dict[str, str] = {}
+        
+        for description in chunk:
+            key = make_cache_key(description, self.model_name, self.template_hash)
+            keys.append(key)
+            if key in results or key in pending:
+                continue
+            
+            cached = self.cache.get(key)
+            if cached is None:
+                pending[key] = description
+            else:
+                results[key] = cached
+        
+        return keys, results, pending
+    
+    def _store_responses(self, pending: Dict[str, str], responses: List[Any], results: Dict[str, Any]) -> None:
+        for key, response in zip(pending, responses):
+            if isinstance(response, Exception):
+                print(ERROR_MESSAGES["llm_classification_error"].format(error=response))
+                results[key] = (None, None)
+                continue
+            
+            results[key] = self._parse_response(response.content)
+            if self._is_cacheable(response):
+                self.cache.set(key, results[key])
+    
+    @staticmethod
+    def _is_corporate(response: str) -> bool:
+        return response.strip().strip('"\'*').upper().startswith(CORPORATE_PREFIX)
+    
+    @classmethod
+    def _parse_response(cls, response: str) -> tuple[bool, str]:
+        if cls._is_corporate(response):
+            return True, CORPORATE_LABEL
+        
+        # If not CORPORATIVO, the response should be the specific event type
+        return False, response.strip().title()
+    
+    @staticmethod
+    def _parse_batch_response(response: str, expected: int) -> List[tuple[bool, str]]:
+        start, end = response.find("["), response.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("batch answer is not a JSON array")
+        
+        items = json.loads(response[start:end + 1])
+        if not isinstance(items, list) or len(items) != expected:
+            raise ValueError(f"expected {expected} classifications")
+        
+        results = []
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("corporativo"), bool):
+                raise ValueError(f"malformed classification: {item!r}")
+            if item["corporativo"]:
+                results.append((True, CORPORATE_LABEL))
+            else:
+                results.append((False, str(item.get("tipo") or "").strip().title()))
+        return results
 
 
-# Global instance
-event_classifier = EventClassifier()
+# Global instance, built on first use
+event_classifier = LazyService(EventClassifier)
 
 
 def classify_event_with_llm(event_description: str) -> tuple[Optional[bool], Optional[str]]:
     return event_classifier.classify_event(event_description)
 
 
+async def aclassify_event_with_llm(event_description: str) -> tuple[Optional[bool], Optional[str]]:
+    return await event_classifier.aclassify_event(event_description)
+
+
+def classify_events_with_llm(
+    event_descriptions: Iterable[str],
+    max_concurrency: Optional[int] = None
+) -> Iterator[tuple[Optional[bool], Optional[str]]]:
+    return event_classifier.classify_events(event_descriptions, max_concurrency)
+
+
 def is_llm_available() -> bool:
     return event_classifier.is_available()
+
+
+def get_llm_backend_stats() -> List[Dict[str, Any]]:
+    if event_classifier.llm is None:
+        return []
+    return event_classifier.llm.stats()
+
+
+def get_classification_cache_stats() -> Dict[str, Any]:
+    return event_classifier.cache.stats()
+
+
+def prewarm_llm_classifier() -> None:
+    event_classifier.prewarm()
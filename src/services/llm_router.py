@@ -0,0 +1,398 @@
+"""
+Routing of LLM requests across several chat model backends.
+
+Each request goes to the fastest healthy backend, judged by a rolling
+window of time-to-first-token and errors. If the first token is late, a
+hedged request goes to the next backend and the first to answer wins; a
+backend that fails is skipped in favor of the next one. The first chunk
+of each answer names the backend that produced it in its
+``response_metadata``.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import AIMessage, BaseMessage, BaseMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from config import LLM_CONFIG
+from services.http_transport import openai_async_http_client, openai_http_client
+from services.local_classifier import CORPORATE_LABEL, classify_event_locally
+from services.metrics import metrics
+
+
+_EMPTY = object()
+# response_metadata key of the backend that answered
+BACKEND_METADATA_KEY = "llm_backend"
+
+
+class LLMBackend:
+    """A chat model plus rolling latency and error stats."""
+    
+    def __init__(
+        self,
+        name: str,
+        model: BaseChatModel,
+        is_available: Callable[[], bool] = lambda: True,
+        fallback: bool = False
+    ):
+        self.name = name
+        self.model = model
+        self.fallback = fallback
+        self._is_available = is_available
+        self._latencies: deque = deque(maxlen=LLM_CONFIG["router_window"])
+        self._outcomes: deque = deque(maxlen=LLM_CONFIG["router_window"])
+        self._last_error_at = float("-inf")
+        self._lock = threading.Lock()
+    
+    def is_available(self) -> bool:
+        return self._is_available()
+    
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._outcomes.append(True)
+        metrics.observe("llm_request_duration_seconds", latency, backend=self.name)
+    
+    def record_error(self) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            self._last_error_at = time.monotonic()
+        metrics.count("llm_request_errors_total", backend=self.name)
+    
+    def percentile(self, q: float) -> float:
+        """Latency percentile over the window; 0 until there is data."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+    
+    def is_healthy(self) -> bool:
+        # An unhealthy backend gets another chance once the cooldown passes
+        cooldown = LLM_CONFIG["router_unhealthy_cooldown_seconds"]
+        return (
+            self.error_rate <= LLM_CONFIG["router_max_error_rate"]
+            or time.monotonic() - self._last_error_at >= cooldown
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "available": self.is_available(),
+            "healthy": self.is_healthy(),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "error_rate": self.error_rate,
+            "requests": len(self._outcomes)
+        }
+
+
+class LocalClassifierChatModel(BaseChatModel):
+    """
+    Offline stand-in that answers the classification prompt with the
+    keyword classifier. Lets the flow run without network access.
+    """
+    
+    @property
+    def _llm_type(self) -> str:
+        return "local-keyword-classifier"
+    
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = str(messages[-1].content)
+        
+        if "Descripciones de los eventos (arreglo JSON):" in prompt:
+            # Batch prompt: a JSON array in, a JSON array out
+            line = prompt.split("Descripciones de los eventos (arreglo JSON):", 1)[1].split("\n", 1)[0]
+            answers = []
+            for description in json.loads(line):
+                result = classify_event_locally(description)
+                answers.append({
+                    "corporativo": bool(result.is_corporate),
+                    "tipo": CORPORATE_LABEL if result.is_corporate else result.event_type or "Otro"
+                })
+            answer = json.dumps(answers, ensure_ascii=False)
+        else:
+            description = prompt.split("Descripción del evento:", 1)[-1].split("\n", 1)[0]
+            result = classify_event_locally(description)
+            if result.is_corporate:
+                answer = CORPORATE_LABEL.upper()
+            else:
+                answer = result.event_type or "Otro"
+        
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+
+
+class LLMRouter(Runnable[LanguageModelInput, BaseMessage]):
+    """Chat model runnable that spreads requests over several backends."""
+    
+    def __init__(self, backends: List[LLMBackend], hedge: bool = True):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = backends
+        self.hedge = hedge
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def is_available(self) -> bool:
+        return any(backend.is_available() for backend in self.backends)
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        return [backend.stats() for backend in self.backends]
+    
+    def answered_by_fallback(self, message: BaseMessage) -> bool:
+        """Whether a fallback backend (the local classifier) produced this answer."""
+        name = message.response_metadata.get(BACKEND_METADATA_KEY)
+        return any(backend.fallback and backend.name == name for backend in self.backends)
+    
+    def ranked(self) -> List[LLMBackend]:
+        """Available backends: healthy first, fallbacks last, then by p50."""
+        candidates = [backend for backend in self.backends if backend.is_available()]
+        if not candidates:
+            raise RuntimeError("No LLM backend available")
+        return sorted(
+            candidates,
+            key=lambda backend: (not backend.is_healthy(), backend.fallback, backend.percentile(0.5))
+        )
+    
+    def invoke(self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any) -> BaseMessage:
+        message = None
+        for chunk in self.stream(input, config, **kwargs):
+            message = chunk if message is None else message + chunk
+        return message if message is not None else AIMessage(content="")
+    
+    async def ainvoke(
+        self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> BaseMessage:
+        message = None
+        async for chunk in self.astream(input, config, **kwargs):
+            message = chunk if message is None else message + chunk
+        return message if message is not None else AIMessage(content="")
+    
+    def stream(
+        self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[BaseMessageChunk]:
+        backend, chunks, first = self._race(input, config, **kwargs)
+        try:
+            if first is not _EMPTY:
+                first.response_metadata[BACKEND_METADATA_KEY] = backend.name
+                yield first
+                yield from chunks
+        except GeneratorExit:
+            # The caller stopped reading early; close the backend stream too
+            chunks.close()
+            raise
+        except Exception:
+            backend.record_error()
+            raise
+    
+    async def astream(
+        self, input: LanguageModelInput, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[BaseMessageChunk]:
+        backend, chunks, first = await self._arace(input, config, **kwargs)
+        try:
+            if first is not _EMPTY:
+                first.response_metadata[BACKEND_METADATA_KEY] = backend.name
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+        except GeneratorExit:
+            await chunks.aclose()
+            raise
+        except Exception:
+            backend.record_error()
+            raise
+    
+    def _hedge_delay(self, backend: LLMBackend) -> float:
+        return max(LLM_CONFIG["hedge_min_delay_seconds"], backend.percentile(0.95))
+    
+    def _race(self, input: LanguageModelInput, config: Optional[RunnableConfig], **kwargs: Any):
+        """Open a stream on the best backend, hedging and failing over as needed."""
+        candidates = self.ranked()
+        executor = self._get_executor()
+        pending: Dict[Future, tuple] = {}
+        launched = 0
+        error: Optional[BaseException] = None
+        
+        def launch() -> None:
+            nonlocal launched
+            backend = candidates[launched % len(candidates)]
+            launched += 1
+            pending[executor.submit(self._open, backend, input, config, **kwargs)] = (backend, time.perf_counter())
+        
+        launch()
+        # A hedge to the only backend would just double its load
+        hedged = not self.hedge or len(candidates) == 1
+        while pending:
+            timeout = None if hedged else self._hedge_delay(candidates[0])
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                launch()
+                continue
+            
+            for future in done:
+                backend, started = pending.pop(future)
+                try:
+                    chunks, first = future.result()
+                except Exception as e:
+                    backend.record_error()
+                    error = e
+                    continue
+                
+                self._record_winner(backend, started, pending.values())
+                for loser in pending:
+                    loser.add_done_callback(self._close_loser)
+                return backend, chunks, first
+            
+            if not pending and launched < len(candidates):
+                launch()
+        
+        raise error
+    
+    async def _arace(self, input: LanguageModelInput, config: Optional[RunnableConfig], **kwargs: Any):
+        candidates = self.ranked()
+        pending: Dict[asyncio.Task, tuple] = {}
+        launched = 0
+        error: Optional[BaseException] = None
+        
+        def launch() -> None:
+            nonlocal launched
+            backend = candidates[launched % len(candidates)]
+            launched += 1
+            task = asyncio.ensure_future(self._aopen(backend, input, config, **kwargs))
+            pending[task] = (backend, time.perf_counter())
+        
+        launch()
+        hedged = not self.hedge or len(candidates) == 1
+        try:
+            while pending:
+                timeout = None if hedged else self._hedge_delay(candidates[0])
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch()
+                    continue
+                
+                for task in done:
+                    backend, started = pending.pop(task)
+                    try:
+                        chunks, first = task.result()
+                    except Exception as e:
+                        backend.record_error()
+                        error = e
+                        continue
+                    
+                    self._record_winner(backend, started, pending.values())
+                    return backend, chunks, first
+                
+                if not pending and launched < len(candidates):
+                    launch()
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    asyncio.ensure_future(task.result()[0].aclose())
+        
+        raise error
+    
+    @staticmethod
+    def _record_winner(backend: LLMBackend, started: float, losers) -> None:
+        now = time.perf_counter()
+        backend.record(now - started)
+        # A hedged request that lost took at least this long
+        for loser, loser_started in losers:
+            loser.record(now - loser_started)
+    
+    @staticmethod
+    def _open(backend: LLMBackend, input, config, **kwargs) -> tuple:
+        chunks = iter(backend.model.stream(input, config, **kwargs))
+        try:
+            return chunks, next(chunks)
+        except StopIteration:
+            return chunks, _EMPTY
+        except BaseException:
+            chunks.close()
+            raise
+    
+    @staticmethod
+    async def _aopen(backend: LLMBackend, input, config, **kwargs) -> tuple:
+        chunks = backend.model.astream(input, config, **kwargs)
+        try:
+            return chunks, await chunks.__anext__()
+        except StopAsyncIteration:
+            return chunks, _EMPTY
+        except BaseException:
+            await chunks.aclose()
+            raise
+    
+    @staticmethod
+    def _close_loser(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            future.result()[0].close()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=LLM_CONFIG["router_max_workers"],
+                    thread_name_prefix="llm-router"
+                )
+            return self._executor
+
+
+def create_backend(spec: str) -> LLMBackend:
+    """
+    Build a backend from a spec: "openai:<model>" or "local".
+    """
+    provider, _, model = spec.partition(":")
+    
+    if provider == "openai":
+        # langchain_openai pulls in the OpenAI SDK; import it only when needed
+        from langchain_openai import ChatOpenAI
+        
+        return LLMBackend(
+            model,
+            ChatOpenAI(
+                model=model,
+                temperature=LLM_CONFIG["temperature"],
+                max_tokens=LLM_CONFIG["max_tokens"],
+                # Report token usage at the end of streamed answers
+                stream_usage=True,
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=openai_http_client.get(),
+                http_async_client=openai_async_http_client.get()
+            ),
+            is_available=lambda: os.getenv("OPENAI_API_KEY") is not None
+        )
+    if provider == "local":
+        return LLMBackend("local", LocalClassifierChatModel(), fallback=True)
+    
+    raise ValueError(f"Unknown LLM backend: {spec}")
+
+
+def create_router() -> LLMRouter:
+    """Router over the backends in LLM_BACKENDS or LLM_CONFIG["backends"]."""
+    specs = os.getenv("LLM_BACKENDS")
+    if specs:
+        specs = [spec.strip() for spec in specs.split(",") if spec.strip()]
+    else:
+        specs = LLM_CONFIG["backends"] or [f"openai:{LLM_CONFIG['model']}"]
+    
+    return LLMRouter([create_backend(spec) for spec in specs], hedge=LLM_CONFIG["hedge_requests"])
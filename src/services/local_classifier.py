@@ -0,0 +1,111 @@
+import re
+from typing import Dict, NamedTuple, Optional
+
+from config import LOCAL_CLASSIFIER_CONFIG
+from services.classification_cache import normalize_description
+
+
+CORPORATE_LABEL = "Corporativo"
+
+# Terms that point to a corporate event, with their weight. Terms are
+# written in normalized form (lowercase, no accents).
+CORPORATE_TERMS: Dict[str, float] = {
+    "corporativo": 1.0, "corporativa": 1.0, "corporate": 1.0,
+    "empresa": 1.0, "empresarial": 1.0, "company": 1.0, "business": 1.0,
+    "conferencia": 1.0, "conference": 1.0, "congreso": 1.0, "convencion": 1.0,
+    "convention": 1.0, "simposio": 1.0, "symposium": 1.0, "summit": 1.0,
+    "seminario": 1.0, "seminar": 1.0, "webinar": 1.0, "workshop": 0.5,
+    "taller": 0.5, "capacitacion": 1.0, "training": 0.5,
+    "lanzamiento de producto": 1.0, "lanzamiento": 0.5, "product launch": 1.0,
+    "team building": 1.0, "networking": 1.0, "offsite": 1.0, "kickoff": 1.0,
+    "town hall": 1.0, "feria comercial": 1.0, "trade show": 1.0, "expo": 0.5,
+    "junta directiva": 1.0, "board meeting": 1.0, "accionistas": 1.0,
+    "shareholders": 1.0, "empleados": 1.0, "employees": 1.0, "colaboradores": 0.5,
+    "clientes": 0.5, "clients": 0.5, "socios": 0.5, "partners": 0.5,
+    "oficina": 0.5, "office": 0.5, "staff": 0.5
+}
+
+# Terms that identify a specific non-corporate event type.
+NON_CORPORATE_TERMS: Dict[str, tuple[str, float]] = {
+    "boda": ("Boda", 1.0), "matrimonio": ("Boda", 1.0), "wedding": ("Boda", 1.0),
+    "cumpleanos": ("Cumpleaños", 1.0), "birthday": ("Cumpleaños", 1.0),
+    "quinceanera": ("Quinceañera", 1.0), "quince anos": ("Quinceañera", 1.0),
+    "bautizo": ("Bautizo", 1.0), "baptism": ("Bautizo", 1.0),
+    "baby shower": ("Baby Shower", 1.0),
+    "graduacion": ("Graduación", 1.0), "graduation": ("Graduación", 1.0),
+    "grado": ("Graduación", 0.5), "prom": ("Graduación", 0.5),
+    "aniversario de bodas": ("Aniversario", 1.0), "anniversary": ("Aniversario", 0.5),
+    "aniversario": ("Aniversario", 0.5),
+    "despedida de soltera": ("Despedida De Soltera", 1.0),
+    "despedida de soltero": ("Despedida De Soltero", 1.0),
+    "bachelorette": ("Despedida De Soltera", 1.0), "bachelor party": ("Despedida De Soltero", 1.0),
+    "primera comunion": ("Primera Comunión", 1.0), "first communion": ("Primera Comunión", 1.0),
+    "reunion familiar": ("Reunión Familiar", 1.0), "family reunion": ("Reunión Familiar", 1.0),
+    "familia": ("Reunión Familiar", 0.5), "family": ("Reunión Familiar", 0.5),
+    "concierto": ("Concierto", 1.0), "concert": ("Concierto", 1.0),
+    "funeral": ("Funeral", 1.0), "velorio": ("Funeral", 1.0)
+}
+
+
+def _compile_terms(*term_groups: Dict[str, object]) -> "re.Pattern[str]":
+    # Longest terms first so multi-word phrases win over their parts
+    terms = sorted((term for group in term_groups for term in group), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b")
+
+
+_TERMS_PATTERN = _compile_terms(CORPORATE_TERMS, NON_CORPORATE_TERMS)
+
+
+class LocalClassification(NamedTuple):
+    is_corporate: Optional[bool]
+    event_type: Optional[str]
+    confidence: float
+    
+    def is_confident(self, llm_available: bool) -> bool:
+        """Whether this result is good enough to skip the LLM tier."""
+        min_confidence = LOCAL_CLASSIFIER_CONFIG[
+            "min_confidence" if llm_available else "offline_min_confidence"
+        ]
+        return self.is_corporate is not None and self.confidence >= min_confidence
+
+
+def classify_event_locally(event_description: str) -> LocalClassification:
+    """
+    Classify an event description with the keyword lexicon.
+    
+    The confidence is the winning side's share of the matched weight,
+    scaled down when the only evidence is a weak term, so mixed signals
+    ("cumpleaños del gerente de la empresa") land near zero.
+    
+    Args:
+        event_description: Description of the event
+        
+    Returns:
+        LocalClassification with (None, None, 0.0) when no term matched
+    """
+    corporate_score = 0.0
+    type_scores: Dict[str, float] = {}
+    
+    for match in _TERMS_PATTERN.finditer(normalize_description(event_description)):
+        term = match.group(0)
+        if term in CORPORATE_TERMS:
+            corporate_score += CORPORATE_TERMS[term]
+        else:
+            event_type, weight = NON_CORPORATE_TERMS[term]
+            type_scores[event_type] = type_scores.get(event_type, 0.0) + weight
+    
+    non_corporate_score = sum(type_scores.values())
+    total = corporate_score + non_corporate_score
+    if total == 0:
+        return LocalClassification(None, None, 0.0)
+    
+    if corporate_score > non_corporate_score:
+        winner = corporate_score
+        result = (True, CORPORATE_LABEL)
+    else:
+        event_type = max(type_scores, key=type_scores.get)
+        winner = type_scores[event_type]
+        result = (False, event_type)
+    
+    confidence = (2 * winner - total) / total * min(1.0, winner)
+    return LocalClassification(result[0], result[1], max(0.0, confidence))
@@ -0,0 +1,222 @@
+"""
+Counters, latency histograms and optional OpenTelemetry spans.
+
+Metrics are kept in process and rendered in the Prometheus text format
+(the server exposes them at /metrics; each uvicorn worker reports its
+own). Instrumentation is off unless METRICS_ENABLED is set, and then
+every call below returns before doing any work.
+
+Recorded series:
+    lead_node_duration_seconds{node,status}   graph node run time
+    lead_user_wait_seconds                    time waiting for the user's reply
+    sheets_api_duration_seconds{method}       one Sheets API request
+    sheets_api_calls_total{method}            Sheets API requests
+    sheets_api_retries_total{status}          retried Sheets requests
+    sheets_leads_written_total                rows appended; calls per lead is
+                                              sheets_api_calls_total / this
+    sheets_outbox_dead_letters_total          outbox rows Sheets kept rejecting
+    llm_request_duration_seconds{backend}     time to first token
+    llm_request_errors_total{backend}         failed LLM requests
+    llm_tokens_total{backend,type}            prompt/completion tokens used
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from config import METRICS_CONFIG
+
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "span", "started")
+    
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.span = None
+    
+    def __enter__(self) -> "_Timer":
+        if self.metrics.tracer is not None:
+            self.span = self.metrics.tracer.start_as_current_span(self.name, attributes=self.labels)
+            self.span.__enter__()
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        if self.span is not None:
+            self.span.__exit__(*exc_info)
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms."""
+    
+    def __init__(self, enabled: bool, buckets: List[float], tracer=None):
+        self.enabled = enabled
+        self.buckets = sorted(buckets)
+        self.tracer = tracer
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, _Histogram]] = {}
+        self._lock = threading.Lock()
+    
+    def count(self, name: str, value: float = 1, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+    
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+    
+    def timer(self, name: str, **labels: str):
+        """Context manager that records the duration of its block."""
+        if not self.enabled:
+            return nullcontext()
+        return _Timer(self, name, labels)
+    
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + [float("inf")], histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key: _LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def instrument_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap an async graph node so each run is timed.
+    
+    Returns the node unchanged when metrics are disabled. LangGraph reads
+    the node's signature through ``functools.wraps`` to decide whether to
+    pass ``config``, so the wrapper forwards whatever it is given.
+    """
+    if not metrics.enabled:
+        return node
+    
+    from langgraph.errors import GraphInterrupt
+    
+    @functools.wraps(node)
+    async def timed_node(*args: Any, **kwargs: Any):
+        status = "ok"
+        started = time.perf_counter()
+        span = metrics.tracer.start_as_current_span(f"node {name}") if metrics.tracer else nullcontext()
+        try:
+            with span:
+                return await node(*args, **kwargs)
+        except GraphInterrupt:
+            # Paused for the user's reply; the node runs again on resume
+            status = "interrupted"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            metrics.observe("lead_node_duration_seconds", time.perf_counter() - started, node=name, status=status)
+    
+    return timed_node
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Counts the tokens reported by chat model responses."""
+    
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+                
+                backend = (getattr(message, "response_metadata", None) or {}).get("model_name", "unknown")
+                metrics.count("llm_tokens_total", usage.get("input_tokens", 0), backend=backend, type="prompt")
+                metrics.count("llm_tokens_total", usage.get("output_tokens", 0), backend=backend, type="completion")
+
+
+def _create_tracer():
+    try:
+        from opentelemetry import trace
+    except ImportError as e:
+        raise RuntimeError("OpenTelemetry tracing needs the opentelemetry-api package.") from e
+    return trace.get_tracer("talkative-agent")
+
+
+def _enabled(variable: str, default: bool) -> bool:
+    value = os.getenv(variable)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def create_metrics() -> Metrics:
+    enabled = _enabled("METRICS_ENABLED", METRICS_CONFIG["enabled"])
+    tracing = enabled and _enabled("METRICS_OTEL", METRICS_CONFIG["otel"])
+    return Metrics(enabled, METRICS_CONFIG["histogram_buckets"], tracer=_create_tracer() if tracing else None)
+
+
+# Global registry; settings are read once at import
+metrics = create_metrics()
+
+# Passed as a callback to chat model calls; None when metrics are off
+token_usage_callbacks: Optional[list] = [TokenUsageCallback()] if metrics.enabled else None
+
+
+def render_metrics() -> str:
+    return metrics.render()
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from config import PROMPT_CONFIG
+
+
+class CompiledPrompt(NamedTuple):
+    template: ChatPromptTemplate
+    content: str
+    # Short content hash; changes whenever the template text does
+    hash: str
+
+
+def extract_section(content: str, section: Optional[str]) -> str:
+    """Return the text after a ``## <section>`` header, or everything if it is missing."""
+    if section is None:
+        return content
+    
+    sections = content.split(f"## {section}")
+    if len(sections) >= 2:
+        return sections[1].strip()
+    return content
+
+
+class _Entry:
+    def __init__(self, path: Path, section: Optional[str]):
+        self.path = path
+        self.section = section
+        self.mtime_ns: Optional[int] = None
+        self.checked_at = float("-inf")
+        self.prompt: Optional[CompiledPrompt] = None
+
+
+class PromptRegistry:
+    """
+    Prompt templates parsed once and served from memory.
+    
+    Each ``get`` looks at the file's mtime at most once per
+    ``reload_check_seconds``; a changed file is re-read, and recompiled
+    only if its content hash changed, so running workers pick up prompt
+    edits without a restart.
+    """
+    
+    def __init__(self, directory: Path, reload_check_seconds: float):
+        self.directory = Path(directory)
+        self.reload_check_seconds = reload_check_seconds
+        self._entries: Dict[tuple, _Entry] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str, section: Optional[str] = None) -> CompiledPrompt:
+        key = (name, section)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.checked_at < self.reload_check_seconds:
+            return entry.prompt
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.directory / name, section)
+            self._refresh(entry)
+            return entry.prompt
+    
+    def _refresh(self, entry: _Entry) -> None:
+        checked_at = time.monotonic()
+        try:
+            mtime_ns = os.stat(entry.path).st_mtime_ns
+            if mtime_ns != entry.mtime_ns:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    content = extract_section(f.read(), entry.section)
+        except OSError:
+            # Keep serving the last version that loaded and look again on the
+            # next get; if none ever did, there is nothing to serve
+            if entry.prompt is None:
+                raise
+            return
+        
+        if mtime_ns != entry.mtime_ns:
+            prompt_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+            if entry.prompt is None or entry.prompt.hash != prompt_hash:
+                entry.prompt = CompiledPrompt(ChatPromptTemplate.from_template(content), content, prompt_hash)
+            entry.mtime_ns = mtime_ns
+        entry.checked_at = checked_at
+
+
+# Global registry over src/prompts
+prompt_registry = PromptRegistry(
+    Path(__file__).parent.parent / "prompts",
+    reload_check_seconds=PROMPT_CONFIG["reload_check_seconds"]
+)
+
+
+def get_prompt_hash(name: str, section: Optional[str] = None) -> str:
+    return prompt_registry.get(name, section).hash
@@ -0,0 +1,46 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class LazyService(Generic[T]):
+    """
+    Proxy that builds a service on first use instead of at import time.
+    
+    Attribute access is forwarded to the underlying instance, so callers
+    use the proxy exactly like the service itself. ``prewarm`` builds the
+    instance in a background thread ahead of the first real call.
+    """
+    
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+    
+    def override(self, instance: T) -> None:
+        """Use ``instance`` instead of building one (benchmarks, tests)."""
+        with self._lock:
+            self._instance = instance
+    
+    def prewarm(self) -> threading.Thread:
+        thread = threading.Thread(target=self.get, daemon=True)
+        thread.start()
+        return thread
+    
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+    
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
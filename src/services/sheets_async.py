@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Dict, List
+from urllib.parse import quote
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from config import SHEETS_CONFIG
+from services.http_transport import get_google_async_http
+from services.metrics import metrics
+from services.sheets_resilience import TokenBucket, aexecute_with_retry
+
+
+class AsyncSheetsClient:
+    """
+    Sheets v4 REST client for asyncio code.
+    
+    Requests go straight to the REST endpoints over a pooled
+    httpx.AsyncClient, so many sessions can have Sheets I/O in flight on
+    one event loop without holding a thread each. It signs requests with
+    the same OAuth credentials as the discovery client, shares its rate
+    limiter and retry policy, and raises the same HttpError on failures.
+    """
+    
+    BASE_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+    
+    def __init__(self, credentials, limiter: TokenBucket):
+        self.credentials = credentials
+        self.limiter = limiter
+    
+    async def get_spreadsheet(self, spreadsheet_id: str, fields: str) -> Dict[str, Any]:
+        return await self._request(
+            "sheets.spreadsheets.get", "GET", f"/{spreadsheet_id}", params={"fields": fields}
+        )
+    
+    async def get_values(self, spreadsheet_id: str, cell_range: str) -> Dict[str, Any]:
+        return await self._request(
+            "sheets.spreadsheets.values.get", "GET",
+            f"/{spreadsheet_id}/values/{quote(cell_range, safe='')}"
+        )
+    
+    async def append_values(
+        self,
+        spreadsheet_id: str,
+        cell_range: str,
+        values: List[List[str]],
+        value_input_option: str = "RAW",
+        insert_data_option: str = "INSERT_ROWS"
+    ) -> Dict[str, Any]:
+        return await self._request(
+            "sheets.spreadsheets.values.append", "POST",
+            f"/{spreadsheet_id}/values/{quote(cell_range, safe='')}:append",
+            params={"valueInputOption": value_input_option, "insertDataOption": insert_data_option},
+            json={"values": values}
+        )
+    
+    async def batch_update(self, spreadsheet_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._request(
+            "sheets.spreadsheets.batchUpdate", "POST",
+            f"/{spreadsheet_id}:batchUpdate",
+            json={"requests": requests}
+        )
+    
+    async def _request(self, method_id: str, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        return await aexecute_with_retry(
+            lambda: self._send(method_id, method, path, **kwargs),
+            self.limiter,
+            max_retries=SHEETS_CONFIG["max_retries"],
+            base_delay=SHEETS_CONFIG["retry_base_delay_seconds"],
+            max_delay=SHEETS_CONFIG["retry_max_delay_seconds"]
+        )
+    
+    async def _send(self, method_id: str, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        import httpx
+        
+        headers: Dict[str, str] = {}
+        await self._apply_credentials(headers)
+        
+        metrics.count("sheets_api_calls_total", method=method_id)
+        with metrics.timer("sheets_api_duration_seconds", method=method_id):
+            try:
+                response = await get_google_async_http().request(
+                    method, self.BASE_URL + path, headers=headers, **kwargs
+                )
+            except httpx.TransportError as e:
+                # Retried like any other network error
+                raise ConnectionError(str(e)) from e
+        
+        if response.status_code >= 400:
+            raise HttpError(
+                httplib2.Response({"status": response.status_code, **response.headers}),
+                response.content,
+                uri=str(response.url)
+            )
+        return response.json()
+    
+    async def _apply_credentials(self, headers: Dict[str, str]) -> None:
+        if not self.credentials.valid:
+            # google-auth refreshes synchronously; keep it off the loop
+            from google.auth.transport.requests import Request
+            
+            await asyncio.to_thread(self.credentials.refresh, Request())
+        self.credentials.apply(headers)
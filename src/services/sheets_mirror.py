@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class LeadTableMirror:
+    """
+    In-memory copy of the lead table.
+    
+    It is filled by one full read, after which only the rows past
+    ``row_count`` need to be fetched, so reads stop scaling with the
+    number of stored leads. Not thread-safe; the owner serializes access.
+    """
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self) -> None:
+        self.headers: List[str] = []
+        self.rows: List[List[str]] = []
+        self.contacts: Set[Tuple[str, str]] = set()
+        self.loaded = False
+        self._contact_col: Optional[int] = None
+        self._contact_type_col: Optional[int] = None
+    
+    @property
+    def row_count(self) -> int:
+        """Rows used in the sheet, including the header row."""
+        return len(self.rows) + (1 if self.headers else 0)
+    
+    @property
+    def contact_columns(self) -> Optional[Tuple[int, int]]:
+        if self._contact_col is None or self._contact_type_col is None:
+            return None
+        return self._contact_col, self._contact_type_col
+    
+    def load(self, values: List[List[str]]) -> None:
+        """Replace the mirror with a full A:H read."""
+        self.reset()
+        self.extend(values)
+        self.loaded = True
+    
+    def extend(self, values: List[List[str]]) -> None:
+        """Add the rows that follow the last mirrored one."""
+        if not self.headers and values:
+            self.headers = values[0]
+            values = values[1:]
+            self._locate_contact_columns()
+        
+        self.rows.extend(values)
+        
+        columns = self.contact_columns
+        if columns is not None:
+            contact_col, contact_type_col = columns
+            min_length = max(columns) + 1
+            self.contacts.update(
+                (row[contact_col], row[contact_type_col]) for row in values if len(row) >= min_length
+            )
+    
+    def records(self) -> List[Dict[str, Any]]:
+        headers = self.headers
+        return [
+            {header: row[i] if i < len(row) else "" for i, header in enumerate(headers)}
+            for row in self.rows
+        ]
+    
+    def _locate_contact_columns(self) -> None:
+        for i, header in enumerate(self.headers):
+            if "Contacto" in header and "Tipo" not in header:
+                self._contact_col = i
+            elif "Tipo de Contacto" in header:
+                self._contact_type_col = i
@@ -0,0 +1,101 @@
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services.sheets_mirror import LeadTableMirror
+
+
+class SheetPartition:
+    """One worksheet of the lead table, with its mirror."""
+    
+    def __init__(self, title: str, sheet_id: Optional[int]):
+        self.title = title
+        self.sheet_id = sheet_id
+        self.mirror = LeadTableMirror()
+        self.loaded_at = 0.0
+        self.checked_at = 0.0
+
+
+class PartitionCatalog:
+    """
+    Worksheets that hold the lead table.
+    
+    Without a scheme there is a single partition, the base worksheet.
+    With ``"monthly"``, each lead goes to the worksheet of the month it
+    was registered in (``"Leads 2026-10"``), created on its first write,
+    while the base worksheet keeps the leads from before partitioning;
+    reads and duplicate checks span all of them. Sheets slows down as a
+    worksheet grows, so this keeps the one that takes writes small.
+    """
+    
+    SCHEMES = {"monthly": ("%Y-%m", r"\d{4}-\d{2}")}
+    
+    def __init__(self, scheme: Optional[str]):
+        if scheme is not None and scheme not in self.SCHEMES:
+            raise ValueError(f"Unknown sheets partitioning: {scheme}")
+        self.scheme = scheme
+        self.base_title: Optional[str] = None
+        self.checked_at = 0.0
+        self._partitions: Dict[str, SheetPartition] = {}
+        self._lock = threading.Lock()
+    
+    def load(self, sheets: List[Dict[str, Any]]) -> None:
+        """
+        Rebuild from a ``spreadsheets.get`` reply: the first worksheet is
+        the base one. Partitions already known keep their mirrors.
+        """
+        properties = [sheet["properties"] for sheet in sheets]
+        if not properties:
+            return
+        
+        with self._lock:
+            if self.base_title != properties[0]["title"]:
+                self._partitions = {}
+            self.base_title = properties[0]["title"]
+            
+            titles = [properties[0]] + [p for p in properties[1:] if self._is_partition_title(p["title"])]
+            self._partitions = {
+                p["title"]: self._partitions.get(p["title"]) or SheetPartition(p["title"], p.get("sheetId"))
+                for p in titles
+            }
+    
+    def partitions(self) -> List[SheetPartition]:
+        """Base worksheet first, then the periods in order."""
+        with self._lock:
+            base = self._partitions.get(self.base_title)
+            rest = sorted(
+                (partition for title, partition in self._partitions.items() if title != self.base_title),
+                key=lambda partition: partition.title
+            )
+        return ([base] if base is not None else []) + rest
+    
+    def get(self, title: str) -> Optional[SheetPartition]:
+        return self._partitions.get(title)
+    
+    def add(self, title: str, sheet_id: int) -> SheetPartition:
+        with self._lock:
+            partition = self._partitions.get(title)
+            if partition is None:
+                partition = self._partitions[title] = SheetPartition(title, sheet_id)
+            return partition
+    
+    def title_for(self, registered_at: datetime) -> str:
+        """Worksheet a lead registered at that time belongs to."""
+        if self.scheme is None:
+            return self.base_title
+        period_format, _ = self.SCHEMES[self.scheme]
+        return f"{self.base_title} {registered_at.strftime(period_format)}"
+    
+    def sheet_id_for(self, title: str) -> int:
+        """
+        Sheet id for a new partition, derived from its period so that
+        processes racing to create it ask for the same one.
+        """
+        return int(re.sub(r"\D", "", title[len(self.base_title):]))
+    
+    def _is_partition_title(self, title: str) -> bool:
+        if self.scheme is None:
+            return False
+        _, period_pattern = self.SCHEMES[self.scheme]
+        return re.fullmatch(f"{re.escape(self.base_title)} {period_pattern}", title) is not None
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import random
+import socket
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from itertools import takewhile
+from typing import Awaitable, Callable, Hashable, List, Optional, Set, Tuple, TypeVar
+
+from googleapiclient.errors import HttpError
+
+from services.metrics import metrics
+
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, socket.timeout)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket sized to the Sheets per-user quota.
+    
+    ``pause`` blocks every caller for a while, which is how a Retry-After
+    from one request throttles all of them.
+    """
+    
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self) -> None:
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+    
+    def _take(self) -> float:
+        """Take a token if one is free; otherwise return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate)
+    
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (seconds or HTTP date) from an HttpError."""
+    if not isinstance(error, HttpError):
+        return None
+    
+    value = error.resp.get("retry-after")
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def execute_with_retry(
+    call: Callable[[], T],
+    limiter: TokenBucket,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float
+) -> T:
+    """
+    Run a Sheets API call under the rate limiter, retrying 429/5xx and
+    network errors with full-jitter exponential backoff. A Retry-After
+    header takes precedence over the computed delay.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            return call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            time.sleep(_backoff(e, limiter, attempt, base_delay, max_delay))
+            attempt += 1
+
+
+async def aexecute_with_retry(
+    call: Callable[[], Awaitable[T]],
+    limiter: TokenBucket,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float
+) -> T:
+    """Async counterpart of ``execute_with_retry``; waits without blocking the loop."""
+    attempt = 0
+    while True:
+        await limiter.aacquire()
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(_backoff(e, limiter, attempt, base_delay, max_delay))
+            attempt += 1
+
+
+def _backoff(error: Exception, limiter: TokenBucket, attempt: int, base_delay: float, max_delay: float) -> float:
+    """Seconds to sleep before retrying; a Retry-After pauses the whole limiter instead."""
+    status = error.resp.status if isinstance(error, HttpError) else type(error).__name__
+    metrics.count("sheets_api_retries_total", status=str(status))
+    
+    delay = retry_after_seconds(error)
+    if delay is not None:
+        limiter.pause(delay)
+        return 0.0
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class SheetsOutbox:
+    """
+    Durable SQLite queue of rows that could not be written to Sheets.
+    
+    Each row counts the replays Sheets rejected outright; rows that keep
+    being rejected move to a dead-letter table so they stop blocking the
+    ones queued behind them.
+    """
+    
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, row TEXT NOT NULL, created_at REAL NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letter ("
+            "id INTEGER PRIMARY KEY, row TEXT NOT NULL, created_at REAL NOT NULL, "
+            "attempts INTEGER NOT NULL, error TEXT NOT NULL, failed_at REAL NOT NULL)"
+        )
+        columns = [column[1] for column in self._connection.execute("PRAGMA table_info(outbox)")]
+        if "attempts" not in columns:
+            # Outboxes created before attempts were counted
+            self._connection.execute("ALTER TABLE outbox ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._connection.commit()
+    
+    def add(self, rows: List[List[str]]) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO outbox (row, created_at) VALUES (?, ?)",
+                [(json.dumps(row, ensure_ascii=False), now) for row in rows]
+            )
+    
+    def peek(self, limit: int) -> List[Tuple[int, List[str]]]:
+        with self._lock:
+            entries = self._connection.execute(
+                "SELECT id, row FROM outbox ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(entry_id, json.loads(row)) for entry_id, row in entries]
+    
+    def remove(self, entry_ids: List[int]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM outbox WHERE id = ?", [(entry_id,) for entry_id in entry_ids]
+            )
+    
+    def record_failure(self, entry_id: int, error: Exception, max_attempts: int) -> bool:
+        """
+        Count a rejected replay of a row.
+        
+        Returns True if that was its last attempt and the row was moved to
+        the dead-letter table.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE outbox SET attempts = attempts + 1 WHERE id = ?", (entry_id,))
+            attempts = self._connection.execute(
+                "SELECT attempts FROM outbox WHERE id = ?", (entry_id,)
+            ).fetchone()
+            if attempts is None or attempts[0] < max_attempts:
+                return False
+            
+            self._connection.execute(
+                "INSERT INTO dead_letter (id, row, created_at, attempts, error, failed_at) "
+                "SELECT id, row, created_at, attempts, ?, ? FROM outbox WHERE id = ?",
+                (str(error), time.time(), entry_id)
+            )
+            self._connection.execute("DELETE FROM outbox WHERE id = ?", (entry_id,))
+            return True
+    
+    def dead_letters(self) -> List[Tuple[List[str], str]]:
+        """Rows Sheets kept rejecting, with the last error, oldest first."""
+        with self._lock:
+            entries = self._connection.execute("SELECT row, error FROM dead_letter ORDER BY id").fetchall()
+        return [(json.loads(row), error) for row, error in entries]
+    
+    def contacts(self, contact_col: int, contact_type_col: int) -> Set[Tuple[str, str]]:
+        """Contact keys of the queued rows, so they still count as duplicates."""
+        return {
+            (row[contact_col], row[contact_type_col])
+            for _, row in self.peek(limit=-1)
+            if len(row) > max(contact_col, contact_type_col)
+        }
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+
+class OutboxDrainer:
+    """
+    Background thread that replays outbox rows in order until it is empty.
+    
+    A retryable error ends the drain until the next interval. When Sheets
+    rejects a batch outright, its rows are replayed one at a time so the
+    row at fault is found; that row's attempt is counted and, once it runs
+    out of attempts, it is dead-lettered and the drain moves past it, back
+    to full batches.
+    
+    With ``group_by``, a replay only takes consecutive rows of the same
+    group (the worksheet they go to), so a failed replay never leaves part
+    of its rows written.
+    """
+    
+    def __init__(
+        self,
+        outbox: SheetsOutbox,
+        replay: Callable[[List[List[str]]], None],
+        interval: float,
+        batch_size: int,
+        max_attempts: int,
+        group_by: Optional[Callable[[List[str]], Hashable]] = None
+    ):
+        self.outbox = outbox
+        self._replay = replay
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.group_by = group_by
+        self._thread = threading.Thread(target=self._run, name="sheets-outbox-drainer", daemon=True)
+        self._thread.start()
+    
+    def drain(self) -> int:
+        """Replay queued rows until they run out or one fails. Returns rows replayed."""
+        replayed = 0
+        # Rows of a rejected batch still to be replayed one at a time
+        narrowed = 0
+        while entries := self._next_entries(1 if narrowed else self.batch_size):
+            try:
+                self._replay([row for _, row in entries])
+            except Exception as e:
+                if is_retryable(e):
+                    break
+                if len(entries) > 1:
+                    narrowed = len(entries)
+                    continue
+                if not self.outbox.record_failure(entries[0][0], e, self.max_attempts):
+                    break
+                metrics.count("sheets_outbox_dead_letters_total")
+                narrowed = max(0, narrowed - 1)
+                continue
+            self.outbox.remove([entry_id for entry_id, _ in entries])
+            replayed += len(entries)
+            narrowed = max(0, narrowed - len(entries))
+        return replayed
+    
+    def _next_entries(self, limit: int) -> List[Tuple[int, List[str]]]:
+        entries = self.outbox.peek(limit)
+        if self.group_by is None or not entries:
+            return entries
+        group = self.group_by(entries[0][1])
+        return list(takewhile(lambda entry: self.group_by(entry[1]) == group, entries))
+    
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.drain()
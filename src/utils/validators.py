@@ -1,14 +1,29 @@
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 import re
 
-from config import MIN_EMAIL_LENGTH, MIN_PHONE_DIGITS, ERROR_MESSAGES, MESSAGES
+from channels.base import ConversationChannel
+from config import MIN_EMAIL_LENGTH, MIN_PHONE_DIGITS, MAX_PHONE_DIGITS, ERROR_MESSAGES, MESSAGES
 
 
-def collect_string(prompt: str, validator: Optional[Callable[[str], bool]] = None) -> str:
+# A single '@', no leading dot and no consecutive dots are enforced by the
+# pattern itself, so validation is one match instead of several scans.
+_EMAIL_PATTERN = re.compile(
+    r'^[a-zA-Z0-9_%+-]+(?:\.[a-zA-Z0-9_%+-]+)*\.?'
+    r'@\.?[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}$'
+)
+_NON_DIGIT_PATTERN = re.compile(r'\D')
+
+
+async def collect_string(
+    channel: ConversationChannel,
+    prompt: str,
+    validator: Optional[Callable[[str], bool]] = None
+) -> str:
     """
     Collect a non-empty string from user input.
     
     Args:
+        channel: Channel used to talk to the user
         prompt: The prompt to display to the user
         validator: Optional validation function
         
@@ -16,17 +31,18 @@ def collect_string(prompt: str, validator: Optional[Callable[[str], bool]] = Non
         Validated string input
     """
     while True:
-        value = input(f"{prompt}: ").strip()
+        value = (await channel.receive(f"{prompt}: ")).strip()
         if value and (validator is None or validator(value)):
             return value
-        print(ERROR_MESSAGES["invalid_input"])
+        await channel.send(ERROR_MESSAGES["invalid_input"])
 
 
-def collect_float(prompt: str, min_value: float = 0.0) -> float:
+async def collect_float(channel: ConversationChannel, prompt: str, min_value: float = 0.0) -> float:
     """
     Collects a valid float from user input.
     
     Args:
+        channel: Channel used to talk to the user
         prompt: The prompt to display to the user
         min_value: Minimum allowed value
         
@@ -35,49 +51,58 @@ def collect_float(prompt: str, min_value: float = 0.0) -> float:
     """
     while True:
         try:
-            value = float(input(f"{prompt}: ").strip())
+            value = float((await channel.receive(f"{prompt}: ")).strip())
             if value >= min_value:
                 return value
-            print(ERROR_MESSAGES["min_value"].format(min_value=min_value))
+            await channel.send(ERROR_MESSAGES["min_value"].format(min_value=min_value))
         except ValueError:
-            print(ERROR_MESSAGES["invalid_number"])
+            await channel.send(ERROR_MESSAGES["invalid_number"])
 
 
-def collect_yes_no_describe() -> tuple[str, str]:
+async def collect_yes_no_describe(channel: ConversationChannel) -> tuple[str, str]:
     """
     Collect user choice for corporate event classification.
     
+    Args:
+        channel: Channel used to talk to the user
+        
     Returns:
         Tuple of (choice, description) where:
         - choice: "yes", "no", or "describe"
         - description: empty string for yes/no, user description for describe
     """
-    print(MESSAGES["event_type_question"])
+    await channel.send(MESSAGES["event_type_question"])
     for option in MESSAGES["event_type_options"]:
-        print(option)
+        await channel.send(option)
     
     while True:
-        choice = input(MESSAGES["event_selection_prompt"]).strip().lower()
+        choice = (await channel.receive(MESSAGES["event_selection_prompt"])).strip().lower()
         
         if choice in ["1", "sí", "si", "yes", "y"]:
             return "yes", ""
         elif choice in ["2", "no", "n"]:
             return "no", ""
         elif choice in ["3", "describir", "describe", "d"]:
-            description = input(MESSAGES["event_description_prompt"]).strip()
+            description = (await channel.receive(MESSAGES["event_description_prompt"])).strip()
             if description:
                 return "describe", description
             else:
-                print(ERROR_MESSAGES["provide_description"])
+                await channel.send(ERROR_MESSAGES["provide_description"])
         else:
-            print(ERROR_MESSAGES["invalid_event_option"])
+            await channel.send(ERROR_MESSAGES["invalid_event_option"])
 
 
-def collect_choice(prompt: str, choices: list[str], case_sensitive: bool = False) -> str:
+async def collect_choice(
+    channel: ConversationChannel,
+    prompt: str,
+    choices: list[str],
+    case_sensitive: bool = False
+) -> str:
     """
     Collect a choice from a list of valid options.
     
     Args:
+        channel: Channel used to talk to the user
         prompt: The prompt to display to the user
         choices: List of valid choices
         case_sensitive: Whether to perform case-sensitive matching
@@ -86,14 +111,14 @@ def collect_choice(prompt: str, choices: list[str], case_sensitive: bool = False
         Valid choice from the list
     """
     while True:
-        value = input(f"{prompt}: ").strip()
+        value = (await channel.receive(f"{prompt}: ")).strip()
         if not case_sensitive:
             value = value.lower()
             choices = [choice.lower() for choice in choices]
         
         if value in choices:
             return value
-        print(ERROR_MESSAGES["invalid_choice"].format(choices=', '.join(choices)))
+        await channel.send(ERROR_MESSAGES["invalid_choice"].format(choices=', '.join(choices)))
 
 
 def validate_email(email: str) -> bool:
@@ -106,25 +131,15 @@ def validate_email(email: str) -> bool:
     Returns:
         True if email is valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
     if not email or len(email) < MIN_EMAIL_LENGTH:
         return False
     
-    # Check for consecutive dots or special characters at start/end
-    if email.startswith('.') or email.endswith('.') or '..' in email:
-        return False
-    
-    # Check for @ symbol count
-    if email.count('@') != 1:
-        return False
-    
-    return bool(re.match(pattern, email))
+    return _EMAIL_PATTERN.match(email) is not None
 
 
 def validate_phone(phone: str) -> bool:
     """
-    Validate phone number using regex pattern.
+    Validate phone number by counting its digits.
     
     Args:
         phone: Phone string to validate
@@ -135,20 +150,7 @@ def validate_phone(phone: str) -> bool:
     if not phone:
         return False
     
-    # Remove all non-digit characters
-    clean_phone = re.sub(r'\D', '', phone)
-    
-    # Check minimum length
-    if len(clean_phone) < MIN_PHONE_DIGITS:
-        return False
-    
-    # Check maximum reasonable length (international numbers can be up to 15 digits)
-    if len(clean_phone) > 15:
-        return False
-    
-    # Check for valid phone patterns (basic validation)
-    # Should contain only digits after cleaning
-    return clean_phone.isdigit()
+    return MIN_PHONE_DIGITS <= len(_NON_DIGIT_PATTERN.sub('', phone)) <= MAX_PHONE_DIGITS
 
 
 def normalize_email(email: str) -> str:
@@ -174,13 +176,17 @@ def normalize_phone(phone: str) -> str:
     Returns:
         Normalized phone string with only digits
     """
-    return re.sub(r'\D', '', phone)
+    return _NON_DIGIT_PATTERN.sub('', phone)
 
 
 def detect_contact_type(contact_input: str) -> tuple[str, str]:
     """
     Automatically detect if the input is an email, phone, or invalid.
     
+    The input is stripped once, matched against the email pattern only if
+    it contains an '@', and reduced to digits once for the phone check,
+    which is also the normalized phone value.
+    
     Args:
         contact_input: The contact information entered by the user
         
@@ -189,36 +195,74 @@ def detect_contact_type(contact_input: str) -> tuple[str, str]:
         - contact_type: "email", "phone", or "invalid"
         - normalized_contact: cleaned/normalized version of the input
     """
-    if not contact_input or not contact_input.strip():
+    if not contact_input:
         return "invalid", ""
     
-    contact_input = contact_input.strip()
+    value = contact_input.strip()
+    if not value:
+        return "invalid", ""
     
-    if validate_email(contact_input):
-        return "email", normalize_email(contact_input)
+    if '@' in value and len(value) >= MIN_EMAIL_LENGTH and _EMAIL_PATTERN.match(value):
+        return "email", value.lower()
     
-    if validate_phone(contact_input):
-        return "phone", normalize_phone(contact_input)
+    digits = _NON_DIGIT_PATTERN.sub('', value)
+    if MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return "phone", digits
     
-    return "invalid", contact_input
+    return "invalid", value
 
 
-def collect_contact_with_detection() -> tuple[str, str]:
+def detect_contact_types(contact_inputs: Iterable[str]) -> list[tuple[str, str]]:
+    """
+    Bulk version of detect_contact_type for imports.
+    
+    Args:
+        contact_inputs: Contact values to classify
+        
+    Returns:
+        List of (contact_type, normalized_contact) in input order
+    """
+    match_email = _EMAIL_PATTERN.match
+    strip_non_digits = _NON_DIGIT_PATTERN.sub
+    min_email, min_phone, max_phone = MIN_EMAIL_LENGTH, MIN_PHONE_DIGITS, MAX_PHONE_DIGITS
+    
+    results = []
+    append = results.append
+    for contact_input in contact_inputs:
+        value = contact_input.strip() if contact_input else ""
+        if not value:
+            append(("invalid", ""))
+        elif '@' in value and len(value) >= min_email and match_email(value):
+            append(("email", value.lower()))
+        else:
+            digits = strip_non_digits('', value)
+            if min_phone <= len(digits) <= max_phone:
+                append(("phone", digits))
+            else:
+                append(("invalid", value))
+    
+    return results
+
+
+async def collect_contact_with_detection(channel: ConversationChannel) -> tuple[str, str]:
     """
     Collect contact information and automatically detect if it's email or phone.
     
+    Args:
+        channel: Channel used to talk to the user
+        
     Returns:
         Tuple of (contact_value, contact_type) where:
         - contact_value: The normalized contact information
         - contact_type: "email" or "phone"
     """
     while True:
-        contact_input = input(MESSAGES["contact_input_prompt"]).strip()
+        contact_input = (await channel.receive(MESSAGES["contact_input_prompt"])).strip()
         
         contact_type, normalized_contact = detect_contact_type(contact_input)
         
         if contact_type == "invalid":
-            print(ERROR_MESSAGES["invalid_contact"])
+            await channel.send(ERROR_MESSAGES["invalid_contact"])
             continue
         
         return normalized_contact, contact_type
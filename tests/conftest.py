@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(ROOT / "src"))
+# The in-process Sheets and LLM fakes are shared with the benchmarks
+sys.path.insert(0, str(ROOT / "benchmarks"))
@@ -0,0 +1,46 @@
+import csv
+
+from flow.batch import RESULT_FIELDS, LeadFileWriter, parse_lead_record, read_lead_records
+
+
+def record(**fields):
+    return {"is_corporate": "sí", "event_type": "Conferencia", "budget": "5000", "name": "Ana", "contact": "ana@example.com", **fields}
+
+
+def test_malformed_jsonl_lines_become_invalid_records(tmp_path):
+    path = tmp_path / "leads.jsonl"
+    path.write_text('{"name": "Ana"}\n{not json\n\n[1, 2]\n', encoding="utf-8")
+    
+    errors = [parse_lead_record(row)[2] for row in read_lead_records(str(path))]
+    
+    assert errors[0] is not None and "línea" not in errors[0]
+    assert "línea 2" in errors[1]
+    assert "línea 4" in errors[2]
+
+
+def test_non_string_text_fields_are_invalid_records():
+    for field in ("name", "event_type", "event_description"):
+        _, _, error = parse_lead_record(record(**{field: 123}))
+        assert error is not None and field in error
+
+
+def test_negative_and_non_finite_budgets_are_rejected():
+    for budget in ("-1", "nan", "inf", "-inf"):
+        state, _, error = parse_lead_record(record(budget=budget))
+        assert error is not None
+        assert state["budget"] is None
+    
+    state, _, error = parse_lead_record(record(budget="0"))
+    assert error is None and state["budget"] == 0.0
+
+
+def test_csv_results_keep_only_result_fields(tmp_path):
+    path = tmp_path / "results.csv"
+    state, _, _ = parse_lead_record(record())
+    
+    writer = LeadFileWriter(str(path))
+    writer.write_rows([{**state, "valid": True, "message": "ok"}])
+    writer.close()
+    
+    with open(path, encoding="utf-8", newline="") as f:
+        assert csv.DictReader(f).fieldnames == RESULT_FIELDS
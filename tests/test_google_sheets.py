@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from config import SHEETS_CONFIG
+from fakes import FakeFaults, FakeGoogleSheetsService, FakeSheets, sheet_with_rows
+
+
+def lead(contact: str) -> dict:
+    return {
+        "is_corporate": True,
+        "event_type": "Conferencia",
+        "event_description": None,
+        "budget": 5000.0,
+        "name": "Ana",
+        "contact": contact,
+        "contact_type": "email",
+        "qualified": True
+    }
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHEETS_OUTBOX_PATH", str(tmp_path / "outbox.db"))
+    monkeypatch.setitem(SHEETS_CONFIG, "max_retries", 0)
+    
+    def build(error_status=None):
+        sheets = FakeSheets(sheet_with_rows(1, SHEETS_CONFIG["headers"]))
+        sheets_service = FakeGoogleSheetsService(sheets)
+        if error_status is not None:
+            # Fail every call from here on, including the mirror read
+            sheets.faults = FakeFaults(error_rate=1.0, error_status=error_status)
+        return sheets_service
+    
+    return build
+
+
+def test_save_lead_appends_and_rejects_duplicates(service):
+    sheets_service = service()
+    
+    assert sheets_service.save_lead(lead("ana@example.com"))
+    assert not sheets_service.save_lead(lead("ana@example.com"))
+    assert len(sheets_service._fake_sheets.rows) == 3
+
+
+def test_retryable_failure_goes_to_the_outbox(service):
+    sheets_service = service(error_status=503)
+    
+    assert sheets_service.save_lead(lead("ana@example.com"))
+    assert len(sheets_service._outbox) == 1
+
+
+def test_permanent_failure_fails_the_save(service):
+    sheets_service = service(error_status=403)
+    
+    assert not sheets_service.save_lead(lead("ana@example.com"))
+    assert len(sheets_service._outbox) == 0
+
+
+def test_failed_async_mirror_read_does_not_block_the_loop(service, monkeypatch):
+    monkeypatch.setitem(SHEETS_CONFIG, "max_retries", 3)
+    monkeypatch.setitem(SHEETS_CONFIG, "retry_base_delay_seconds", 0.2)
+    sheets_service = service(error_status=503)
+    gaps = []
+    
+    async def ticker(done: asyncio.Event) -> None:
+        last = time.monotonic()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+    
+    async def main() -> "Future[bool]":
+        done = asyncio.Event()
+        ticking = asyncio.ensure_future(ticker(done))
+        await asyncio.sleep(0.05)
+        future = await sheets_service.asubmit_lead(lead("ana@example.com"))
+        done.set()
+        await ticking
+        return future
+    
+    future = asyncio.run(main())
+    
+    assert max(gaps) < 0.15
+    assert not future.done() or future.result()
+    sheets_service.close()
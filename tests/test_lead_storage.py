@@ -0,0 +1,72 @@
+import pytest
+
+from config import SHEETS_CONFIG
+from fakes import FakeGoogleSheetsService, FakeSheets, sheet_with_rows
+from services.google_sheets import sheets_service
+from services.lead_storage import ReplicatedLeadStorage, SheetsLeadStorage, SQLiteLeadStorage
+
+
+def lead(contact: str) -> dict:
+    return {
+        "is_corporate": True,
+        "event_type": "Conferencia",
+        "event_description": None,
+        "budget": 5000.0,
+        "name": "Ana",
+        "contact": contact,
+        "contact_type": "email",
+        "qualified": True
+    }
+
+
+@pytest.fixture
+def fake_sheets(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHEETS_OUTBOX_PATH", str(tmp_path / "outbox.db"))
+    sheets = FakeSheets(sheet_with_rows(2, SHEETS_CONFIG["headers"]))
+    service = FakeGoogleSheetsService(sheets)
+    monkeypatch.setattr(sheets_service, "_instance", service)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def primary(tmp_path):
+    return SQLiteLeadStorage(str(tmp_path / "leads.db"))
+
+
+def replicator(primary: SQLiteLeadStorage) -> ReplicatedLeadStorage:
+    # The background pass runs once at start and then waits out the interval
+    return ReplicatedLeadStorage(primary, interval=3600, batch_size=10)
+
+
+def test_replicate_marks_duplicates_synced(fake_sheets, primary):
+    primary.save_lead(lead("existing0@bench.test"))
+    primary.save_lead(lead("ana@example.com"))
+    
+    storage = replicator(primary)
+    storage.flush()
+    
+    assert primary.get_unsynced(10) == []
+    assert len(fake_sheets._fake_sheets.rows) == 4
+    storage.close()
+
+
+def test_replicate_keeps_leads_the_writer_did_not_accept(fake_sheets, primary):
+    fake_sheets._get_writer().close()
+    for i in range(3):
+        primary.save_lead(lead(f"lead{i}@example.com"))
+    
+    storage = replicator(primary)
+    
+    assert storage.replicate() == 0
+    assert len(primary.get_unsynced(10)) == 3
+    assert len(fake_sheets._fake_sheets.rows) == 3
+    storage.close()
+
+
+def test_sheets_storage_reports_duplicates_and_closed_writer_as_not_saved(fake_sheets):
+    storage = SheetsLeadStorage()
+    
+    assert not storage.save_lead(lead("existing0@bench.test"))
+    fake_sheets._get_writer().close()
+    assert not storage.save_lead(lead("ana@example.com"))
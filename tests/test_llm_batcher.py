@@ -0,0 +1,95 @@
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from services.llm_batcher import MicroBatcher
+
+
+class Calls:
+    """call_batch/call_one pair that records what it was asked."""
+    
+    def __init__(self, fail_batch=False, short_batch=False):
+        self.fail_batch = fail_batch
+        self.short_batch = short_batch
+        self.batches = []
+        self.singles = []
+    
+    async def call_batch(self, items):
+        self.batches.append(items)
+        if self.fail_batch:
+            raise ValueError("bad batch answer")
+        results = [item.upper() for item in items]
+        return results[:-1] if self.short_batch else results
+    
+    async def call_one(self, item):
+        self.singles.append(item)
+        if item == "boom":
+            raise RuntimeError(item)
+        return item.upper()
+
+
+def run_batch(calls, items, max_batch_size=16):
+    batcher = MicroBatcher(calls.call_batch, calls.call_one, max_batch_size=max_batch_size, max_wait_seconds=0.01)
+    
+    async def submit_all():
+        return await asyncio.gather(*(batcher.submit(item) for item in items), return_exceptions=True)
+    
+    return asyncio.run(submit_all())
+
+
+def test_concurrent_items_share_one_call():
+    calls = Calls()
+    
+    assert run_batch(calls, ["a", "b", "c"]) == ["A", "B", "C"]
+    assert calls.batches == [["a", "b", "c"]]
+    assert calls.singles == []
+
+
+def test_lone_item_goes_to_call_one():
+    calls = Calls()
+    
+    assert run_batch(calls, ["a"]) == ["A"]
+    assert calls.batches == []
+    assert calls.singles == ["a"]
+
+
+def test_full_batch_is_sent_without_waiting():
+    calls = Calls()
+    
+    assert run_batch(calls, ["a", "b", "c", "d", "e"], max_batch_size=2) == ["A", "B", "C", "D", "E"]
+    assert calls.batches == [["a", "b"], ["c", "d"]]
+    assert calls.singles == ["e"]
+
+
+@pytest.mark.parametrize("calls", [Calls(fail_batch=True), Calls(short_batch=True)])
+def test_bad_batch_falls_back_to_one_call_per_item(calls):
+    assert run_batch(calls, ["a", "b"]) == ["A", "B"]
+    assert sorted(calls.singles) == ["a", "b"]
+
+
+def test_fallback_error_only_reaches_its_caller():
+    results = run_batch(Calls(fail_batch=True), ["a", "boom"])
+    
+    assert results[0] == "A"
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_batch_prompt_edits_invalidate_async_cache_keys(tmp_path, monkeypatch):
+    from services import llm_classifier
+    from services.prompt_registry import PromptRegistry
+    
+    prompts = tmp_path / "prompts"
+    shutil.copytree(Path(llm_classifier.__file__).parent.parent / "prompts", prompts)
+    monkeypatch.setattr(llm_classifier, "prompt_registry", PromptRegistry(prompts, reload_check_seconds=0))
+    monkeypatch.setenv("LLM_BACKENDS", "local")
+    classifier = llm_classifier.EventClassifier()
+    single_hash, async_hash = classifier.template_hash, classifier._async_template_hash()
+    
+    batch_prompt = prompts / llm_classifier.CLASSIFICATION_BATCH_PROMPT
+    batch_prompt.write_text(batch_prompt.read_text(encoding="utf-8") + "\nResponde solo el arreglo.\n", encoding="utf-8")
+    classifier._refresh_chain()
+    
+    assert classifier.template_hash == single_hash
+    assert classifier._async_template_hash() != async_hash
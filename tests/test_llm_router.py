@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from config import LLM_CONFIG
+from fakes import FakeChatModel
+from services.llm_router import BACKEND_METADATA_KEY, LLMBackend, LLMRouter, LocalClassifierChatModel
+
+
+PROMPT = [HumanMessage(content="Descripción del evento: conferencia anual de la empresa\n")]
+
+
+@pytest.fixture(autouse=True)
+def fast_hedging(monkeypatch):
+    monkeypatch.setitem(LLM_CONFIG, "hedge_min_delay_seconds", 0.05)
+
+
+def test_single_backend_is_not_hedged():
+    model = FakeChatModel(latency=0.2)
+    router = LLMRouter([LLMBackend("slow", model)])
+    
+    assert router.invoke(PROMPT).content == "CORPORATIVO"
+    assert model.calls == 1
+
+
+def test_async_single_backend_is_not_hedged():
+    model = FakeChatModel(latency=0.2)
+    router = LLMRouter([LLMBackend("slow", model)])
+    
+    assert asyncio.run(router.ainvoke(PROMPT)).content == "CORPORATIVO"
+    assert model.calls == 1
+
+
+def test_slow_backend_is_hedged_and_the_faster_answer_wins():
+    slow = FakeChatModel(latency=0.5)
+    fast = FakeChatModel()
+    router = LLMRouter([LLMBackend("slow", slow), LLMBackend("fast", fast)])
+    # Rank the slow backend first
+    router.backends[1].record(1.0)
+    
+    answer = router.invoke(PROMPT)
+    
+    assert answer.response_metadata[BACKEND_METADATA_KEY] == "fast"
+    assert slow.calls == 1 and fast.calls == 1
+
+
+def test_failing_backend_fails_over_to_the_next():
+    broken = FakeChatModel(error_rate=1.0)
+    router = LLMRouter([LLMBackend("broken", broken), LLMBackend("local", LocalClassifierChatModel(), fallback=True)])
+    
+    answer = asyncio.run(router.ainvoke(PROMPT))
+    
+    assert answer.content == "CORPORATIVO"
+    assert router.answered_by_fallback(answer)
+    assert router.backends[0].error_rate == 1.0
+
+
+def test_fallbacks_rank_last_and_unhealthy_backends_after_healthy_ones():
+    primary = LLMBackend("primary", FakeChatModel())
+    local = LLMBackend("local", LocalClassifierChatModel(), fallback=True)
+    router = LLMRouter([local, primary])
+    
+    assert [backend.name for backend in router.ranked()] == ["primary", "local"]
+    
+    for _ in range(3):
+        primary.record_error()
+    assert [backend.name for backend in router.ranked()] == ["local", "primary"]
+
+
+def test_classifier_does_not_cache_fallback_answers(monkeypatch):
+    from services.llm_classifier import EventClassifier
+    
+    monkeypatch.setenv("LLM_BACKENDS", "local")
+    monkeypatch.delenv("CLASSIFICATION_CACHE_PATH", raising=False)
+    classifier = EventClassifier()
+    
+    assert classifier.classify_event("conferencia anual de la empresa") == (True, "Corporativo")
+    assert asyncio.run(classifier.aclassify_event("boda en la playa"))[0] is False
+    assert list(classifier.classify_events(["cumpleaños de mi hijo"]))[0][0] is False
+    assert len(classifier.cache.memory) == 0
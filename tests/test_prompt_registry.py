@@ -0,0 +1,25 @@
+import pytest
+
+from services.prompt_registry import PromptRegistry
+
+
+def test_missing_prompt_keeps_raising_until_it_loads(tmp_path):
+    registry = PromptRegistry(tmp_path, reload_check_seconds=3600)
+    
+    for _ in range(2):
+        with pytest.raises(OSError):
+            registry.get("prompt.md")
+    
+    (tmp_path / "prompt.md").write_text("Clasifica: {event_description}", encoding="utf-8")
+    assert registry.get("prompt.md").content == "Clasifica: {event_description}"
+
+
+def test_last_loaded_prompt_is_served_while_the_file_is_missing(tmp_path):
+    path = tmp_path / "prompt.md"
+    path.write_text("Clasifica: {event_description}", encoding="utf-8")
+    registry = PromptRegistry(tmp_path, reload_check_seconds=0)
+    first = registry.get("prompt.md")
+    
+    path.unlink()
+    
+    assert registry.get("prompt.md") is first
@@ -0,0 +1,109 @@
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from services.sheets_resilience import OutboxDrainer, SheetsOutbox
+
+
+def http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+class FakeSheets:
+    """Replay target that rejects some rows and can be taken offline."""
+    
+    def __init__(self, rejected=(), offline=False):
+        self.rejected = set(rejected)
+        self.offline = offline
+        self.rows = []
+        self.calls = []
+    
+    def append(self, rows):
+        self.calls.append(len(rows))
+        if self.offline:
+            raise http_error(503)
+        if any(row[0] in self.rejected for row in rows):
+            raise http_error(400)
+        self.rows.extend(rows)
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return SheetsOutbox(str(tmp_path / "outbox.db"))
+
+
+def make_drainer(outbox, sheets, max_attempts=3, **kwargs):
+    return OutboxDrainer(outbox, sheets.append, interval=3600, batch_size=10, max_attempts=max_attempts, **kwargs)
+
+
+def test_drain_replays_rows_in_order(outbox):
+    sheets = FakeSheets()
+    outbox.add([["a"], ["b"], ["c"]])
+    
+    assert make_drainer(outbox, sheets).drain() == 3
+    assert sheets.rows == [["a"], ["b"], ["c"]]
+    assert len(outbox) == 0
+
+
+def test_retryable_error_keeps_rows_without_counting_attempts(outbox):
+    sheets = FakeSheets(offline=True)
+    drainer = make_drainer(outbox, sheets, max_attempts=1)
+    outbox.add([["a"], ["b"]])
+    
+    for _ in range(3):
+        assert drainer.drain() == 0
+    
+    assert len(outbox) == 2
+    assert outbox.dead_letters() == []
+
+
+def test_rejected_row_is_dead_lettered_and_unblocks_the_rest(outbox):
+    sheets = FakeSheets(rejected={"bad"})
+    drainer = make_drainer(outbox, sheets, max_attempts=2)
+    outbox.add([["a"], ["bad"], ["c"]])
+    
+    # First drain: "a" goes through one at a time, "bad" uses its first attempt
+    assert drainer.drain() == 1
+    assert sheets.rows == [["a"]]
+    assert len(outbox) == 2
+    
+    # Second drain: "bad" runs out of attempts and "c" is no longer blocked
+    assert drainer.drain() == 1
+    assert sheets.rows == [["a"], ["c"]]
+    assert len(outbox) == 0
+    assert [row for row, _ in outbox.dead_letters()] == [["bad"]]
+
+
+def test_attempts_survive_reopening(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    sheets = FakeSheets(rejected={"bad"})
+    
+    first = SheetsOutbox(path)
+    first.add([["bad"]])
+    make_drainer(first, sheets, max_attempts=2).drain()
+    
+    second = SheetsOutbox(path)
+    make_drainer(second, sheets, max_attempts=2).drain()
+    assert len(second) == 0
+    assert len(second.dead_letters()) == 1
+
+
+def test_drain_goes_back_to_full_batches_past_the_rejected_batch(outbox):
+    sheets = FakeSheets(rejected={"bad"})
+    rows = [["bad"] if i == 1 else [str(i)] for i in range(12)]
+    outbox.add(rows)
+    
+    assert make_drainer(outbox, sheets, max_attempts=1).drain() == 11
+    # The rejected batch of 10 goes one row at a time, the rows after it in one batch
+    assert sheets.calls == [10] + [1] * 10 + [2]
+    assert len(outbox) == 0
+
+
+def test_replays_do_not_span_groups(outbox):
+    sheets = FakeSheets()
+    outbox.add([["a", "1"], ["b", "1"], ["c", "2"], ["d", "1"]])
+    
+    drainer = make_drainer(outbox, sheets, group_by=lambda row: row[1])
+    
+    assert drainer.drain() == 4
+    assert sheets.calls == [2, 1, 1]
@@ -0,0 +1,121 @@
+import threading
+from datetime import datetime
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from config import SHEETS_CONFIG
+from fakes import FakeGoogleSheetsService, FakeSheets, sheet_with_rows
+from services.sheets_partitions import PartitionCatalog
+
+
+def sheets_reply(*titles):
+    return [{"properties": {"title": title, "sheetId": index}} for index, title in enumerate(titles)]
+
+
+def lead(contact: str) -> dict:
+    return {
+        "is_corporate": True,
+        "event_type": "Conferencia",
+        "event_description": None,
+        "budget": 5000.0,
+        "name": "Ana",
+        "contact": contact,
+        "contact_type": "email",
+        "qualified": True
+    }
+
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError):
+        PartitionCatalog("weekly")
+
+
+def test_without_scheme_everything_goes_to_the_base_worksheet():
+    catalog = PartitionCatalog(None)
+    catalog.load(sheets_reply("Leads", "Leads 2026-09"))
+    
+    assert catalog.title_for(datetime(2026, 10, 18)) == "Leads"
+    assert [partition.title for partition in catalog.partitions()] == ["Leads"]
+
+
+def test_monthly_catalog_orders_partitions_and_ignores_other_worksheets():
+    catalog = PartitionCatalog("monthly")
+    catalog.load(sheets_reply("Leads", "Leads 2026-10", "Notas", "Leads 2026-09"))
+    
+    assert catalog.title_for(datetime(2026, 10, 18)) == "Leads 2026-10"
+    assert catalog.sheet_id_for("Leads 2026-10") == 202610
+    assert [partition.title for partition in catalog.partitions()] == ["Leads", "Leads 2026-09", "Leads 2026-10"]
+
+
+def test_reload_keeps_known_mirrors():
+    catalog = PartitionCatalog("monthly")
+    catalog.load(sheets_reply("Leads", "Leads 2026-10"))
+    partition = catalog.get("Leads 2026-10")
+    
+    catalog.load(sheets_reply("Leads", "Leads 2026-10", "Leads 2026-11"))
+    
+    assert catalog.get("Leads 2026-10") is partition
+    assert catalog.get("Leads 2026-11") is not None
+
+
+@pytest.fixture
+def monthly_service(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHEETS_OUTBOX_PATH", str(tmp_path / "outbox.db"))
+    monkeypatch.setenv("SHEETS_PARTITIONING", "monthly")
+    return FakeGoogleSheetsService(FakeSheets(sheet_with_rows(1, SHEETS_CONFIG["headers"])))
+
+
+def test_first_write_of_a_month_creates_its_worksheet(monthly_service):
+    assert monthly_service.save_lead(lead("ana@example.com"))
+    
+    title = f"Leads {datetime.now():%Y-%m}"
+    _, rows = monthly_service._fake_sheets.worksheets[title]
+    assert rows[0] == SHEETS_CONFIG["headers"]
+    assert rows[1][4] == "ana@example.com"
+    # Leads from before partitioning still count as duplicates
+    assert not monthly_service.save_lead(lead("existing0@bench.test"))
+
+
+def test_index_lock_is_free_while_sheets_is_called(monthly_service):
+    acquired = []
+    execute = monthly_service._execute
+    
+    def probe():
+        if monthly_service._index_lock.acquire(timeout=1):
+            monthly_service._index_lock.release()
+            acquired.append(True)
+        else:
+            acquired.append(False)
+    
+    def execute_and_probe(request):
+        # Another thread must be able to take the index lock mid-call
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return execute(request)
+    
+    monthly_service._execute = execute_and_probe
+    assert monthly_service.save_lead(lead("ana@example.com"))
+    assert acquired and all(acquired)
+
+
+def test_rejected_partition_fails_a_batch_spanning_partitions(monthly_service):
+    statuses = {"Leads 2026-09": 503, "Leads 2026-10": 403}
+    
+    def append_to_partition(partition, rows):
+        if partition.title in statuses:
+            raise HttpError(httplib2.Response({"status": statuses[partition.title]}), b"")
+    
+    monthly_service._append_to_partition = append_to_partition
+    rows = [
+        ["Sí", "Conferencia", "$5,000.00", "Ana", f"{month}@example.com", "email", "Sí", f"2026-{month}-01 00:00:00"]
+        for month in ("08", "09", "10")
+    ]
+    
+    with pytest.raises(HttpError):
+        monthly_service._append_rows(rows)
+    
+    # Only the retryable failure is queued for a replay
+    assert [row for _, row in monthly_service._outbox.peek(10)] == [rows[1]]
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_with_one_key_run_once():
+    flight = SingleFlight("test")
+    calls = []
+    started = threading.Event()
+    
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "result"
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert calls == [1]
+    assert results == ["result"] * 8
+
+
+def test_errors_reach_every_waiter_and_free_the_key():
+    flight = SingleFlight("test")
+    
+    with pytest.raises(ValueError):
+        flight.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    
+    # Nothing is cached: the next call runs again
+    assert flight.do("key", lambda: 2) == 2
+
+
+def test_async_calls_share_one_task():
+    flight = AsyncSingleFlight("test")
+    calls = []
+    
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+    
+    async def main():
+        same = await asyncio.gather(*(flight.do("key", lambda: slow("a")) for _ in range(5)))
+        other = await flight.do("other", lambda: slow("b"))
+        return same, other
+    
+    same, other = asyncio.run(main())
+    
+    assert same == ["a"] * 5
+    assert other == "b"
+    assert calls == ["a", "b"]
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = AsyncSingleFlight("test")
+    
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+    
+    async def main():
+        first = asyncio.ensure_future(flight.do("key", slow))
+        second = asyncio.ensure_future(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(main()) == "done"
+
+
+def test_async_key_is_not_reused_across_loops():
+    flight = AsyncSingleFlight("test")
+    
+    async def value():
+        return asyncio.get_running_loop()
+    
+    first = asyncio.run(flight.do("key", value))
+    second = asyncio.run(flight.do("key", value))
+    
+    assert first is not second
@@ -0,0 +1,32 @@
+import asyncio
+
+import flow.speculation
+from flow.speculation import ClassificationSpeculator
+
+
+async def never_answers(description):
+    await asyncio.sleep(3600)
+
+
+def test_take_after_the_loop_of_the_speculation_closed(monkeypatch):
+    monkeypatch.setattr(flow.speculation, "aclassify_event_with_llm", never_answers)
+    speculator = ClassificationSpeculator(ttl_seconds=60)
+    
+    async def start():
+        speculator.start("a", "Conferencia anual")
+        speculator.start("b", "Conferencia anual")
+    
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(start())
+    loop.close()
+    
+    async def take():
+        # Restarting "b" discards its task on the closed loop
+        speculator.start("b", "Conferencia anual")
+        future = speculator.take("a", "Conferencia anual")
+        assert future.get_loop() is asyncio.get_running_loop()
+        future.cancel()
+        speculator.take("b", "Conferencia anual").cancel()
+    
+    asyncio.run(take())
+    assert len(speculator) == 0